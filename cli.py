@@ -6,216 +6,405 @@ import click
 from pathlib import Path
 from rich.console import Console
 from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich import print as rprint
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque
+from itertools import islice
+from sys import intern
 
 from config import Config
-from src.discovery import ModuleScanner
-from src.parsers import ModelParser, ViewParser
-from src.graph import Neo4jLoader
-from src.incremental import ChangeDetector, StateManager
-from src.query import QueryEngine
-from src.visualization import GraphVisualizer
+
+# Los módulos pesados (parsers, driver de Neo4j, pyvis/networkx, barras de
+# progreso) se importan dentro de cada comando: así `--help` y los comandos
+# livianos no pagan su carga, y los workers de parsing solo importan parsers.
 
 console = Console()
 
+# Diccionario vacío compartido para registros sin atributos.
+# Es de solo lectura: ningún consumidor debe mutarlo.
+_EMPTY_ATTRS: dict = {}
+
 
-def parse_module(module):
+def parse_module(module_name, module_path):
     """
     Parsea un módulo individual (modelos y vistas).
-    Diseñado para ejecutarse en paralelo.
+    Diseñado para ejecutarse en un proceso worker: recibe solo tipos
+    primitivos para que el envío al pool sea barato de serializar.
 
     Args:
-        module: Objeto Module a parsear
+        module_name: Nombre del módulo
+        module_path: Ruta al directorio del módulo
 
     Returns:
         Tupla (lista_modelos, lista_vistas)
     """
-    module_path = Path(module.path)
+    from src.parsers import ModelParser, ViewParser
+
+    module_path = Path(module_path)
 
     # Parsear modelos
-    model_parser = ModelParser(module.name)
+    model_parser = ModelParser(module_name)
     models = model_parser.parse_directory(module_path)
 
     # Parsear vistas
-    view_parser = ViewParser(module.name)
+    view_parser = ViewParser(module_name)
     views = view_parser.parse_directory(module_path)
 
     return ([m.to_dict() for m in models], [v.to_dict() for v in views])
 
 
-def organize_data_for_loading(modules, all_models, all_views):
+# Columnas de cada categoría de datos organizados (nodos primero,
+# relaciones después). El orden define la posición de cada valor en
+# _ColumnBuffer.append.
+ORGANIZED_COLUMNS = {
+    # Nodos
+    "modules": (
+        "name", "path", "version", "depends", "description",
+        "author", "category", "installable", "auto_install",
+    ),
+    "models": (
+        "name", "description", "module", "file_path", "class_name",
+        "model_type", "is_abstract", "is_extension", "is_transient",
+    ),
+    "fields": ("model_name", "field_name", "field_type", "related_model", "attributes"),
+    "views": ("xml_id", "name", "model", "view_type", "module", "file_path", "priority"),
+    # Nodos referenciados (padres/destinos) que no se parsearon en esta carga
+    "model_placeholders": ("name",),
+    "view_placeholders": ("xml_id",),
+    # Relaciones
+    "module_dependencies": ("from", "to"),
+    "model_module_rels": ("model", "module"),
+    "model_inheritances": ("child", "parent"),
+    "model_delegations": ("child", "parent", "field"),
+    "field_model_rels": ("field_name", "model_name"),
+    "field_references": ("field_name", "model_name", "related_model"),
+    "view_module_rels": ("view_xml_id", "module"),
+    "view_model_rels": ("view_xml_id", "model"),
+    "view_inheritances": ("child", "parent"),
+}
+
+
+class _ColumnBuffer:
     """
-    Organiza los datos parseados en estructuras optimizadas para carga.
-    Separa nodos de relaciones para cargar en orden óptimo.
+    Buffer columnar (SoA) de una categoría: una lista por atributo en lugar
+    de un diccionario por registro. Al vaciarse entrega tuplas; los
+    diccionarios que espera el UNWIND de Neo4j los arma el loader.
+
+    Las columnas se preasignan con la capacidad del batch y se reutilizan
+    entre vaciados (se escribe por índice con un cursor), evitando los
+    realloc de crecer por append en cada batch.
+    """
+
+    __slots__ = ("names", "columns", "size", "capacity")
+
+    def __init__(self, names, capacity):
+        self.names = names
+        self.capacity = max(capacity, 1)
+        self.columns = tuple([None] * self.capacity for _ in names)
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def append(self, *values):
+        """Agrega un registro (valores en el orden de las columnas)."""
+        index = self.size
+        if index == self.capacity:
+            # Un modelo puede aportar más filas que el batch: crecer por bloques
+            for column in self.columns:
+                column.extend([None] * self.capacity)
+            self.capacity *= 2
+        for column, value in zip(self.columns, values):
+            column[index] = value
+        self.size = index + 1
+
+    def drain(self):
+        """Materializa el batch como lista de tuplas y vacía el buffer."""
+        rows = list(islice(zip(*self.columns), self.size))
+        self.size = 0
+        return rows
+
+
+def _drain_batches(pending, batch_size, force=False):
+    """
+    Emite los batches pendientes que alcanzaron el tamaño de batch.
 
     Args:
-        modules: Lista de módulos
-        all_models: Lista de modelos parseados
-        all_views: Lista de vistas parseadas
+        pending: Diccionario categoría -> _ColumnBuffer
+        batch_size: Tamaño máximo de batch
+        force: Emitir también los batches incompletos (fin de fase)
 
-    Returns:
-        Diccionario con datos organizados
+    Yields:
+        Tuplas (categoría, nombres de columna, filas como tuplas)
     """
-    console.print("\n[cyan]Organizando datos para carga optimizada...[/cyan]")
-
-    data = {
-        # Nodos primero
-        "modules": [m.to_dict() for m in modules],
-        "models": [],
-        "views": [],
-        "fields": [],
-
-        # Relaciones después
-        "module_dependencies": [],
-        "model_module_rels": [],
-        "model_inheritances": [],
-        "model_delegations": [],
-        "field_model_rels": [],
-        "field_references": [],
-        "view_module_rels": [],
-        "view_model_rels": [],
-        "view_inheritances": []
-    }
+    for category, buffer in pending.items():
+        if len(buffer) and (force or len(buffer) >= batch_size):
+            yield category, buffer.names, buffer.drain()
 
-    # Extraer dependencias de módulos
-    for module in modules:
-        for dep in module.depends:
-            data["module_dependencies"].append({
-                "from": module.name,
-                "to": dep
-            })
 
-    # Procesar modelos
-    for model in all_models:
-        if not model.get("name"):
+def iter_organized_batches(modules, all_models, all_views):
+    """
+    Organiza los datos parseados en batches listos para carga.
+    Patrón ETL en streaming: en lugar de materializar una lista completa por
+    categoría, se emiten batches de como máximo Config.BATCH_SIZE registros,
+    de modo que nunca se retiene más de un batch por categoría.
+
+    Todos los nodos se emiten antes que cualquier relación, para que los
+    MATCH de la fase de relaciones encuentren los nodos ya creados.
+
+    Cada nodo se emite una sola vez por clave, con los datos de su última
+    aparición (la misma precedencia que MERGE ... SET aplicado en orden):
+    una pasada previa registra solo la posición de la última aparición de
+    cada clave, así que no se retienen filas. Con claves únicas los batches
+    de nodos pueden ejecutarse en paralelo sin crear nodos duplicados.
+
+    Args:
+        modules: Lista de módulos como diccionarios (OdooModule.to_dict)
+        all_models: Modelos parseados (cualquier iterable re-recorrible)
+        all_views: Vistas parseadas (cualquier iterable re-recorrible)
+
+    Yields:
+        Tuplas (categoría, nombres de columna, filas) con categoría en
+        "modules", "models", "field_references", etc. y cada fila una tupla
+        en el orden de ORGANIZED_COLUMNS
+    """
+    batch_size = Config.BATCH_SIZE
+    pending = {
+        category: _ColumnBuffer(names, batch_size)
+        for category, names in ORGANIZED_COLUMNS.items()
+    }
+
+    # Posición de la última aparición de cada clave de nodo: las apariciones
+    # anteriores se descartan (extensiones de un mismo modelo, campos
+    # redefinidos, módulos o vistas repetidos)
+    last_module = {module["name"]: index for index, module in enumerate(modules)}
+    last_model = {}
+    last_field = {}
+    for index, model in enumerate(all_models):
+        model_name = model.get("name")
+        if not model_name:
             continue
+        last_model[model_name] = index
+        for position, field in enumerate(model.get("fields", ())):
+            if field.get("name"):
+                last_field[(model_name, field["name"])] = (index, position)
+    last_view = {}
+    for index, view in enumerate(all_views):
+        if view.get("xml_id") and view.get("model"):
+            last_view[view["xml_id"]] = index
+
+    # ===== FASE 1: Nodos =====
+    modules_buffer = pending["modules"]
+    module_columns = ORGANIZED_COLUMNS["modules"]
+    for index, module in enumerate(modules):
+        if last_module[module["name"]] != index:
+            continue
+        modules_buffer.append(*(module[column] for column in module_columns))
+        yield from _drain_batches(pending, batch_size)
+
+    # Nombres referenciados, para crear una sola vez los nodos destino de
+    # herencias/referencias que no se parsearon (los cargados son last_model)
+    referenced_models = set()
 
-        # Calcular model_type
-        is_transient = model.get("is_transient", False)
-        inherits = model.get("inherits", [])
+    models_buffer = pending["models"]
+    fields_buffer = pending["fields"]
+    for index, model in enumerate(all_models):
         model_name = model.get("name")
+        if not model_name:
+            continue
+
+        referenced_models.update(model.get("inherits", ()))
+        referenced_models.update(model.get("inherits_models") or _EMPTY_ATTRS)
+
+        # Los campos se recorren en todas las apariciones del modelo (una
+        # extensión puede aportar campos nuevos); el nodo, solo en la última
+        if last_model[model_name] == index:
+            # Nodo de modelo (sin relaciones). model_type ya viene
+            # clasificado desde los workers de parsing (OdooModel.model_type).
+            # Las columnas de baja cardinalidad (módulo, tipos) se internan:
+            # los strings que llegan del pool son copias distintas aunque el
+            # valor se repita
+            models_buffer.append(
+                model_name,
+                model.get("description", ""),
+                intern(model["module"]),
+                model["file_path"],
+                model["class_name"],
+                intern(model["model_type"]),
+                model.get("is_abstract", False),
+                model.get("is_extension", False),
+                model.get("is_transient", False),
+            )
+
+        # Nodos de campo
+        for position, field in enumerate(model.get("fields", [])):
+            if not field.get("name"):
+                continue
+            if last_field[(model_name, field["name"])] != (index, position):
+                continue
+
+            related_model = field.get("related_model")
+            if related_model:
+                referenced_models.add(related_model)
+
+            fields_buffer.append(
+                model_name,
+                field["name"],
+                intern(field.get("field_type") or ""),
+                related_model,
+                field.get("attributes") or _EMPTY_ATTRS,
+            )
+
+        yield from _drain_batches(pending, batch_size)
+
+    referenced_views = set()
 
-        if is_transient:
-            model_type = "transient"
-        elif not model_name:
-            model_type = "mixin"
-        elif inherits and model_name in inherits:
-            model_type = "extension"
-        elif inherits and model_name not in inherits:
-            model_type = "redefined"
-        else:
-            model_type = "base"
-
-        # Nodo de modelo (sin relaciones)
-        data["models"].append({
-            "name": model_name,
-            "description": model.get("description", ""),
-            "module": model["module"],
-            "file_path": model["file_path"],
-            "class_name": model["class_name"],
-            "model_type": model_type,
-            "is_abstract": model.get("is_abstract", False),
-            "is_extension": model.get("is_extension", False),
-            "is_transient": is_transient
-        })
+    views_buffer = pending["views"]
+    for index, view in enumerate(all_views):
+        if not view.get("xml_id") or not view.get("model"):
+            continue
+        if view.get("inherit_id"):
+            referenced_views.add(view["inherit_id"])
+        if last_view[view["xml_id"]] != index:
+            continue
+
+        # Nodo de vista (sin relaciones)
+        views_buffer.append(
+            view["xml_id"],
+            view.get("name", ""),
+            view["model"],
+            intern(view.get("view_type") or ""),
+            intern(view["module"]),
+            view.get("file_path", ""),
+            view.get("priority", 16),
+        )
+        yield from _drain_batches(pending, batch_size)
+
+    # Padres y destinos externos a esta carga: la fase 2 los resuelve con
+    # MATCH en lugar de un MERGE por cada arista
+    placeholders_buffer = pending["model_placeholders"]
+    for name in referenced_models - last_model.keys():
+        placeholders_buffer.append(name)
+        yield from _drain_batches(pending, batch_size)
+
+    placeholders_buffer = pending["view_placeholders"]
+    for xml_id in referenced_views - last_view.keys():
+        placeholders_buffer.append(xml_id)
+        yield from _drain_batches(pending, batch_size)
+
+    yield from _drain_batches(pending, batch_size, force=True)
+
+    # ===== FASE 2: Relaciones =====
+    # Aristas ya emitidas, para no enviar MERGE duplicados a Neo4j
+    seen_module_deps = set()
+    seen_model_modules = set()
+    seen_inheritances = set()
+    seen_delegations = set()
+    seen_field_models = set()
+    seen_references = set()
+    seen_view_modules = set()
+    seen_view_models = set()
+
+    for module in modules:
+        for dep in module["depends"]:
+            key = (module["name"], dep)
+            if key in seen_module_deps:
+                continue
+            seen_module_deps.add(key)
+            pending["module_dependencies"].append(module["name"], dep)
+        yield from _drain_batches(pending, batch_size)
+
+    for model in all_models:
+        model_name = model.get("name")
+        if not model_name:
+            continue
 
         # Relación módulo→modelo
-        data["model_module_rels"].append({
-            "model": model["name"],
-            "module": model["module"]
-        })
+        key = (model_name, model["module"])
+        if key not in seen_model_modules:
+            seen_model_modules.add(key)
+            pending["model_module_rels"].append(model_name, model["module"])
 
         # Herencias
         for parent in model.get("inherits", []):
-            data["model_inheritances"].append({
-                "child": model["name"],
-                "parent": parent
-            })
+            key = (model_name, parent)
+            if key in seen_inheritances:
+                continue
+            seen_inheritances.add(key)
+            pending["model_inheritances"].append(model_name, parent)
 
         # Delegaciones
-        for parent, field in model.get("inherits_models", {}).items():
-            data["model_delegations"].append({
-                "child": model["name"],
-                "parent": parent,
-                "field": field
-            })
-
-        # Procesar campos
+        for parent, field in (model.get("inherits_models") or _EMPTY_ATTRS).items():
+            key = (model_name, parent, field)
+            if key in seen_delegations:
+                continue
+            seen_delegations.add(key)
+            pending["model_delegations"].append(model_name, parent, field)
+
         for field in model.get("fields", []):
             field_name = field.get("name")
             if not field_name:
                 continue
 
-            # Nodo de campo
-            data["fields"].append({
-                "model_name": model["name"],
-                "field_name": field_name,
-                "field_type": field.get("field_type", ""),
-                "related_model": field.get("related_model"),
-                "attributes": field.get("attributes", {})
-            })
-
             # Relación campo→modelo
-            data["field_model_rels"].append({
-                "field_name": field_name,
-                "model_name": model["name"]
-            })
+            key = (field_name, model_name)
+            if key not in seen_field_models:
+                seen_field_models.add(key)
+                pending["field_model_rels"].append(field_name, model_name)
 
             # Referencias a otros modelos
-            if field.get("related_model"):
-                data["field_references"].append({
-                    "field_name": field_name,
-                    "model_name": model["name"],
-                    "related_model": field["related_model"]
-                })
-
-    # Procesar vistas
+            related_model = field.get("related_model")
+            if related_model:
+                key = (model_name, field_name, related_model)
+                if key not in seen_references:
+                    seen_references.add(key)
+                    pending["field_references"].append(
+                        field_name, model_name, related_model
+                    )
+
+        yield from _drain_batches(pending, batch_size)
+
     for view in all_views:
         if not view.get("xml_id") or not view.get("model"):
             continue
 
-        # Nodo de vista (sin relaciones)
-        data["views"].append({
-            "xml_id": view["xml_id"],
-            "name": view.get("name", ""),
-            "model": view["model"],
-            "view_type": view.get("view_type", ""),
-            "module": view["module"],
-            "file_path": view.get("file_path", ""),
-            "priority": view.get("priority", 16)
-        })
-
         # Relación módulo→vista
-        data["view_module_rels"].append({
-            "view_xml_id": view["xml_id"],
-            "module": view["module"]
-        })
+        key = (view["xml_id"], view["module"])
+        if key not in seen_view_modules:
+            seen_view_modules.add(key)
+            pending["view_module_rels"].append(view["xml_id"], view["module"])
 
         # Relación vista→modelo
-        data["view_model_rels"].append({
-            "view_xml_id": view["xml_id"],
-            "model": view["model"]
-        })
+        key = (view["xml_id"], view["model"])
+        if key not in seen_view_models:
+            seen_view_models.add(key)
+            pending["view_model_rels"].append(view["xml_id"], view["model"])
 
         # Herencias de vistas
         if view.get("inherit_id"):
-            data["view_inheritances"].append({
-                "child": view["xml_id"],
-                "parent": view["inherit_id"]
-            })
+            pending["view_inheritances"].append(view["xml_id"], view["inherit_id"])
+
+        yield from _drain_batches(pending, batch_size)
+
+    yield from _drain_batches(pending, batch_size, force=True)
 
-    # Mostrar estadísticas
-    console.print(f"  • {len(data['modules'])} módulos")
-    console.print(f"  • {len(data['models'])} modelos")
-    console.print(f"  • {len(data['views'])} vistas")
-    console.print(f"  • {len(data['fields'])} campos")
-    console.print(f"  • {len(data['module_dependencies'])} dependencias de módulos")
-    console.print(f"  • {len(data['model_inheritances'])} herencias de modelos")
-    console.print(f"  • {len(data['field_references'])} referencias entre campos")
 
-    return data
+def print_load_stats(load_stats):
+    """
+    Muestra el resumen de una carga organizada.
+
+    Args:
+        load_stats: Diccionario devuelto por Neo4jLoader.load_organized_data
+    """
+    table = Table(title="Resumen de Carga")
+    table.add_column("Categoría", style="cyan")
+    table.add_column("Registros", style="magenta", justify="right")
+
+    for category, count in load_stats["counts"].items():
+        table.add_row(category, str(count))
+
+    console.print(table)
+    console.print(f"  • Tiempo nodos: {load_stats['nodes_time']:.2f}s")
+    console.print(f"  • Tiempo relaciones: {load_stats['rels_time']:.2f}s")
+    console.print(f"  • Tiempo total: {load_stats['total_time']:.2f}s")
 
 
 @click.group()
@@ -235,6 +424,13 @@ def cli():
 @click.option("--clear", is_flag=True, help="Limpiar el grafo antes de cargar")
 def load(source, full, clear):
     """Carga el código fuente de Odoo en Neo4j."""
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+    from src.discovery import ModuleScanner
+    from src.graph import Neo4jLoader
+    from src.incremental import ChangeDetector, StateManager
+    from src.parsers import ModelParser
+
     source_path = Path(source or Config.ODOO_SOURCE_PATH)
 
     if not source_path.exists():
@@ -243,6 +439,10 @@ def load(source, full, clear):
 
     console.print(f"[bold blue]Analizando código fuente de Odoo en:[/bold blue] {source_path}")
 
+    if clear:
+        # Sin entradas viejas: el cache se repuebla con los archivos actuales
+        ModelParser.clear_cache()
+
     try:
         with Progress(
             SpinnerColumn(),
@@ -253,6 +453,8 @@ def load(source, full, clear):
             task = progress.add_task("Descubriendo módulos...", total=None)
             scanner = ModuleScanner(source_path)
             modules = scanner.scan()
+            # Convertir una sola vez: lo usan la detección de cambios y la carga
+            modules_as_dicts = [m.to_dict() for m in modules]
             progress.update(task, completed=True)
             console.print(f"[green]✓[/green] {len(modules)} módulos encontrados")
 
@@ -261,19 +463,14 @@ def load(source, full, clear):
                 task = progress.add_task("Detectando cambios...", total=None)
                 state_manager = StateManager()
                 detector = ChangeDetector(state_manager)
-                strategy = detector.get_incremental_strategy(
-                    [m.to_dict() for m in modules]
-                )
+                strategy = detector.get_incremental_strategy(modules_as_dicts)
                 progress.update(task, completed=True)
 
                 console.print(f"[yellow]Estrategia:[/yellow] {strategy['reason']}")
 
                 if not strategy["full_reload"]:
-                    modules_to_process = [
-                        m
-                        for m in modules
-                        if m.name in [cm["name"] for cm in strategy["changed_modules"]]
-                    ]
+                    changed_names = {cm["name"] for cm in strategy["changed_modules"]}
+                    modules_to_process = [m for m in modules if m.name in changed_names]
                     console.print(
                         f"[cyan]Procesando {len(modules_to_process)} módulos modificados[/cyan]"
                     )
@@ -282,17 +479,21 @@ def load(source, full, clear):
             else:
                 modules_to_process = modules
                 state_manager = StateManager()
+                detector = ChangeDetector(state_manager)
 
             # 3. Parsear modelos y vistas (en paralelo)
             task = progress.add_task("Parseando modelos y vistas...", total=None)
-            all_models = []
-            all_views = []
-
-            # Usar ThreadPoolExecutor para parsing paralelo
-            with ThreadPoolExecutor(max_workers=Config.MAX_WORKERS) as executor:
+            # deque: extend sin realocar/copiar todo el bloque al crecer;
+            # iter_organized_batches consume los deques directamente
+            all_models = deque()
+            all_views = deque()
+
+            # Usar ProcessPoolExecutor: el parsing (AST/XML) es CPU-bound y
+            # con threads quedaría serializado por el GIL
+            with ProcessPoolExecutor(max_workers=Config.MAX_WORKERS) as executor:
                 # Enviar todos los módulos para procesamiento paralelo
                 future_to_module = {
-                    executor.submit(parse_module, module): module
+                    executor.submit(parse_module, module.name, module.path): module
                     for module in modules_to_process
                 }
 
@@ -313,11 +514,13 @@ def load(source, full, clear):
                 f"[green]✓[/green] {len(all_models)} modelos y {len(all_views)} vistas parseados"
             )
 
-            # 3.5. Organizar datos (patrón ETL)
-            organized_data = organize_data_for_loading(modules, all_models, all_views)
-
-        # 4. Cargar en Neo4j (fuera del Progress context para usar su propia lógica de progreso)
-        with Neo4jLoader() as loader:
+        # 4. Cargar en Neo4j (el loader informa su avance en esta barra)
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            TextColumn("{task.completed} registros"),
+            console=console,
+        ) as progress, Neo4jLoader(progress=progress) as loader:
             # Configurar esquema
             loader.setup_schema()
 
@@ -325,16 +528,21 @@ def load(source, full, clear):
             if clear or full:
                 loader.clear_graph()
                 console.print("[yellow]Grafo limpiado[/yellow]")
+                # Grafo vacío: crear nodos sin chequeo de unicidad por fila
+                loader.bulk_load_mode(True)
 
-            # Cargar datos organizados
-            loader.load_organized_data(organized_data)
+            # Cargar datos organizados en streaming (patrón ETL)
+            console.print("\n[cyan]Organizando datos para carga optimizada...[/cyan]")
+            load_stats = loader.load_organized_data(
+                iter_organized_batches(modules_as_dicts, all_models, all_views)
+            )
+            print_load_stats(load_stats)
 
             # Obtener estadísticas
             stats = loader.get_stats()
 
         # 5. Actualizar estado
-        for module in modules_to_process:
-            state_manager.mark_module_processed(Path(module.path))
+        detector.mark_modules_processed(Path(module.path) for module in modules_to_process)
         state_manager.save_state()
 
         # Mostrar resumen
@@ -366,6 +574,8 @@ def query():
 @click.argument("model_name")
 def query_model_children(model_name):
     """Obtiene los modelos que heredan de un modelo."""
+    from src.query import QueryEngine
+
     with QueryEngine() as engine:
         results = engine.get_model_children(model_name)
 
@@ -388,6 +598,8 @@ def query_model_children(model_name):
 @click.argument("model_name")
 def query_model_parents(model_name):
     """Obtiene los modelos padre de un modelo."""
+    from src.query import QueryEngine
+
     with QueryEngine() as engine:
         results = engine.get_model_parents(model_name)
 
@@ -410,6 +622,8 @@ def query_model_parents(model_name):
 @click.argument("model_name")
 def query_model_views(model_name):
     """Obtiene las vistas de un modelo."""
+    from src.query import QueryEngine
+
     with QueryEngine() as engine:
         results = engine.get_views_for_model(model_name)
 
@@ -435,6 +649,8 @@ def query_model_views(model_name):
 @click.argument("model_name")
 def query_model_relations(model_name):
     """Obtiene las relaciones de campos de un modelo."""
+    from src.query import QueryEngine
+
     with QueryEngine() as engine:
         results = engine.get_model_relations(model_name)
 
@@ -461,6 +677,8 @@ def query_model_relations(model_name):
 @click.argument("model_name")
 def query_model_impact(model_name):
     """Analiza el impacto de un modelo."""
+    from src.query import QueryEngine
+
     with QueryEngine() as engine:
         result = engine.get_model_impact(model_name)
 
@@ -483,6 +701,8 @@ def query_model_impact(model_name):
 @click.argument("search_term")
 def query_search(search_term):
     """Busca modelos por nombre."""
+    from src.query import QueryEngine
+
     with QueryEngine() as engine:
         results = engine.search_models(search_term)
 
@@ -523,6 +743,8 @@ def visualize():
 @click.option("--depth", "-d", default=3, help="Profundidad de la jerarquía")
 def viz_model_hierarchy(model_name, output, depth):
     """Visualiza la jerarquía de herencia de un modelo."""
+    from src.visualization import GraphVisualizer
+
     with GraphVisualizer() as viz:
         output_path = Path(output)
         viz.visualize_model_hierarchy(model_name, output_path, depth)
@@ -542,6 +764,8 @@ def viz_model_hierarchy(model_name, output, depth):
 )
 def viz_model_relations(model_name, output):
     """Visualiza las relaciones de campos de un modelo."""
+    from src.visualization import GraphVisualizer
+
     with GraphVisualizer() as viz:
         output_path = Path(output)
         viz.visualize_model_relations(model_name, output_path)
@@ -561,6 +785,8 @@ def viz_model_relations(model_name, output):
 )
 def viz_module_deps(module, output):
     """Visualiza las dependencias entre módulos."""
+    from src.visualization import GraphVisualizer
+
     with GraphVisualizer() as viz:
         output_path = Path(output)
         viz.visualize_module_dependencies(module, output_path)
@@ -572,6 +798,8 @@ def viz_module_deps(module, output):
 @cli.command()
 def stats():
     """Muestra estadísticas del grafo."""
+    from src.graph import Neo4jLoader
+
     with Neo4jLoader() as loader:
         stats = loader.get_stats()
 
@@ -589,15 +817,20 @@ def stats():
 
 @cli.command()
 def clear():
-    """Limpia el grafo y el estado."""
+    """Limpia el grafo, el estado y el cache de parseo."""
+    from src.graph import Neo4jLoader
+    from src.incremental import StateManager
+    from src.parsers import ModelParser
+
     if click.confirm("¿Deseas limpiar completamente el grafo y el estado?"):
         with Neo4jLoader() as loader:
             loader.clear_graph()
 
         state_manager = StateManager()
         state_manager.clear_state()
+        ModelParser.clear_cache()
 
-        console.print("[green]✓ Grafo y estado limpiados[/green]")
+        console.print("[green]✓ Grafo, estado y cache de parseo limpiados[/green]")
 
 
 if __name__ == "__main__":
@@ -15,17 +15,27 @@ class Config:
     NEO4J_URI = os.getenv("NEO4J_URI", "bolt://localhost:7687")
     NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
     NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "password")
+    # Conexiones máximas del pool del driver (default del driver: 100)
+    NEO4J_MAX_POOL_SIZE = int(os.getenv("NEO4J_MAX_POOL_SIZE", "100"))
 
     # Odoo source paths
     ODOO_SOURCE_PATH = os.getenv("ODOO_SOURCE_PATH", "/path/to/odoo")
 
     # Cache and state
     CACHE_DIR = Path(".cache")
-    STATE_FILE = CACHE_DIR / "state.json"
+    STATE_FILE = CACHE_DIR / "state.db"
+    # Modelos parseados por archivo (se reutilizan si el archivo no cambió)
+    PARSE_CACHE_DIR = CACHE_DIR / "parse"
 
     # Performance tuning
     BATCH_SIZE = int(os.getenv("BATCH_SIZE", "1000"))  # Aumentado de 100 a 1000
     MAX_WORKERS = int(os.getenv("MAX_WORKERS", "4"))
+    # Batches enviados a Neo4j en paralelo (una sesión por hilo)
+    LOAD_CONCURRENCY = int(os.getenv("LOAD_CONCURRENCY", "4"))
+
+    # APOC (requiere el plugin instalado en el servidor Neo4j)
+    USE_APOC = os.getenv("USE_APOC", "false").lower() in ("1", "true", "yes")
+    APOC_BATCH_SIZE = int(os.getenv("APOC_BATCH_SIZE", "1000"))
 
     # Filters
     EXCLUDE_PATTERNS = ["__pycache__", "*.pyc", ".git", "test_*"]
@@ -1,13 +1,19 @@
 """
 Escaneo y descubrimiento de módulos Odoo en el filesystem.
 """
-import json
+import ast
+import os
+import orjson
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from fnmatch import fnmatchcase
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass, asdict
+from config import Config
 
 
-@dataclass
+@dataclass(slots=True)
 class OdooModule:
     """Representa un módulo de Odoo con sus metadatos."""
 
@@ -26,11 +32,75 @@ class OdooModule:
         return asdict(self)
 
 
+def _safe_eval_manifest(content: str) -> Dict:
+    """
+    Evalúa el contenido del manifest de forma segura.
+
+    Los manifests de Odoo son literales de diccionario, así que se usa
+    ast.literal_eval: no compila ni ejecuta código, solo acepta literales.
+
+    Args:
+        content: Contenido del archivo
+
+    Returns:
+        Diccionario con datos del manifest
+    """
+    try:
+        result = ast.literal_eval(content)
+        return result if isinstance(result, dict) else {}
+    except (ValueError, SyntaxError, MemoryError):
+        return {}
+
+
+def _parse_module_worker(module_path: str, manifest_path: str) -> Optional[OdooModule]:
+    """
+    Parsea el manifest y crea un objeto OdooModule.
+    Función de módulo para poder ejecutarse en un ProcessPoolExecutor.
+
+    Args:
+        module_path: Ruta del módulo
+        manifest_path: Ruta al archivo manifest
+
+    Returns:
+        OdooModule o None si hay error
+    """
+    module_path = Path(module_path)
+    manifest_path = Path(manifest_path)
+
+    try:
+        # read_bytes + decode evita el TextIOWrapper intermedio de read_text
+        manifest_content = manifest_path.read_bytes().decode("utf-8", "replace")
+        manifest_data = _safe_eval_manifest(manifest_content)
+
+        if not isinstance(manifest_data, dict):
+            return None
+
+        return OdooModule(
+            name=module_path.name,
+            path=str(module_path.absolute()),
+            version=manifest_data.get("version", "1.0"),
+            depends=manifest_data.get("depends", []),
+            description=manifest_data.get("summary", "")
+            or manifest_data.get("description", ""),
+            author=manifest_data.get("author", ""),
+            category=manifest_data.get("category", "Uncategorized"),
+            installable=manifest_data.get("installable", True),
+            auto_install=manifest_data.get("auto_install", False),
+        )
+
+    except Exception as e:
+        print(f"Error parseando manifest {manifest_path}: {e}")
+        return None
+
+
 class ModuleScanner:
     """Escáner de módulos Odoo."""
 
     MANIFEST_FILES = ["__manifest__.py", "__openerp__.py"]
 
+    # Manifests por tarea enviada al pool (amortiza el IPC de archivos pequeños)
+    PARSE_CHUNKSIZE = 16
+
     def __init__(self, root_path: Path):
         """
         Inicializa el escáner.
@@ -42,103 +112,112 @@ class ModuleScanner:
         if not self.root_path.exists():
             raise ValueError(f"La ruta {root_path} no existe")
 
+        # Separar nombres exactos (lookup O(1)) de patrones glob reales
+        self._exclude_names = {
+            p for p in Config.EXCLUDE_PATTERNS if not any(c in p for c in "*?[")
+        }
+        self._exclude_globs = [
+            p for p in Config.EXCLUDE_PATTERNS if p not in self._exclude_names
+        ]
+
     def scan(self) -> List[OdooModule]:
         """
         Escanea el directorio en busca de módulos Odoo.
 
+        Recorre el árbol en anchura con os.scandir, podando los directorios
+        excluidos por Config.EXCLUDE_PATTERNS y sin descender dentro de un
+        módulo (los módulos Odoo no se anidan). Los manifests encontrados se
+        parsean después en paralelo con un ProcessPoolExecutor.
+
         Returns:
             Lista de módulos encontrados
         """
-        modules = []
-
-        for path in self.root_path.rglob("*"):
-            if not path.is_dir():
-                continue
-
-            # Verificar si contiene un manifest
-            manifest = self._find_manifest(path)
-            if manifest:
-                try:
-                    module = self._parse_module(path, manifest)
-                    if module:
-                        modules.append(module)
-                except Exception as e:
-                    print(f"Error procesando módulo en {path}: {e}")
-
-        return modules
+        module_paths, manifest_paths = self._find_module_dirs()
+
+        if len(module_paths) <= self.PARSE_CHUNKSIZE:
+            # Pocos módulos: no compensa arrancar procesos
+            results = map(_parse_module_worker, module_paths, manifest_paths)
+            return [module for module in results if module]
+
+        with ProcessPoolExecutor(max_workers=Config.MAX_WORKERS) as executor:
+            results = executor.map(
+                _parse_module_worker,
+                module_paths,
+                manifest_paths,
+                chunksize=self.PARSE_CHUNKSIZE,
+            )
+            return [module for module in results if module]
 
-    def _find_manifest(self, module_path: Path) -> Optional[Path]:
+    def _find_module_dirs(self) -> Tuple[List[str], List[str]]:
         """
-        Busca el archivo manifest en el directorio.
+        Recorre el árbol buscando directorios con manifest.
 
-        Args:
-            module_path: Ruta del módulo
+        Sigue los enlaces simbólicos a directorios; cada directorio se
+        identifica por (st_dev, st_ino) para no visitarlo dos veces ni
+        entrar en ciclos.
 
         Returns:
-            Ruta al manifest o None si no existe
+            Tupla (rutas de módulos, rutas de manifests) alineadas por posición
         """
-        for manifest_name in self.MANIFEST_FILES:
-            manifest_path = module_path / manifest_name
-            if manifest_path.exists():
-                return manifest_path
-        return None
+        module_paths = []
+        manifest_paths = []
+        pending = deque([str(self.root_path)])
+        visited = set()
+
+        while pending:
+            directory = pending.popleft()
+            manifests = {}
+            subdirs = []
+
+            try:
+                stat = os.stat(directory)
+                if (stat.st_dev, stat.st_ino) in visited:
+                    continue
+                visited.add((stat.st_dev, stat.st_ino))
+
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.name in self.MANIFEST_FILES:
+                            manifests[entry.name] = entry.path
+                        elif entry.is_dir() and not self._is_excluded(
+                            entry.name
+                        ):
+                            subdirs.append(entry.path)
+            except OSError as e:
+                print(f"Error listando {directory}: {e}")
+                continue
 
-    def _parse_module(
-        self, module_path: Path, manifest_path: Path
-    ) -> Optional[OdooModule]:
-        """
-        Parsea el manifest y crea un objeto OdooModule.
+            # Respetar la prioridad de MANIFEST_FILES si hay más de uno
+            manifest = next(
+                (manifests[name] for name in self.MANIFEST_FILES if name in manifests),
+                None,
+            )
+            if manifest is None:
+                pending.extend(subdirs)
+                continue
 
-        Args:
-            module_path: Ruta del módulo
-            manifest_path: Ruta al archivo manifest
+            # El directorio raíz no pasa por la poda de subdirectorios
+            if self._is_excluded(os.path.basename(directory)):
+                continue
 
-        Returns:
-            OdooModule o None si hay error
-        """
-        try:
-            # Leer y evaluar el manifest (eval seguro en contexto controlado)
-            manifest_content = manifest_path.read_text(encoding="utf-8")
-            manifest_data = self._safe_eval_manifest(manifest_content)
-
-            if not isinstance(manifest_data, dict):
-                return None
-
-            return OdooModule(
-                name=module_path.name,
-                path=str(module_path.absolute()),
-                version=manifest_data.get("version", "1.0"),
-                depends=manifest_data.get("depends", []),
-                description=manifest_data.get("summary", "")
-                or manifest_data.get("description", ""),
-                author=manifest_data.get("author", ""),
-                category=manifest_data.get("category", "Uncategorized"),
-                installable=manifest_data.get("installable", True),
-                auto_install=manifest_data.get("auto_install", False),
-            )
+            module_paths.append(directory)
+            manifest_paths.append(manifest)
 
-        except Exception as e:
-            print(f"Error parseando manifest {manifest_path}: {e}")
-            return None
+        return module_paths, manifest_paths
 
-    def _safe_eval_manifest(self, content: str) -> Dict:
+    def _is_excluded(self, name: str) -> bool:
         """
-        Evalúa el contenido del manifest de forma segura.
+        Verifica si un directorio coincide con Config.EXCLUDE_PATTERNS.
 
         Args:
-            content: Contenido del archivo
+            name: Nombre del directorio
 
         Returns:
-            Diccionario con datos del manifest
+            True si debe excluirse del escaneo
         """
-        # Crear namespace limitado para eval
-        namespace = {"__builtins__": {}}
-        try:
-            # Evaluar el contenido
-            result = eval(content, namespace)
-            return result if isinstance(result, dict) else {}
-        except:
-            return {}
+        if name in self._exclude_names:
+            return True
+        return any(fnmatchcase(name, pattern) for pattern in self._exclude_globs)
 
     def export_to_json(self, modules: List[OdooModule], output_path: Path) -> None:
         """
@@ -148,8 +227,8 @@ class ModuleScanner:
             modules: Lista de módulos
             output_path: Ruta de salida
         """
-        data = [module.to_dict() for module in modules]
-        output_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        # orjson serializa dataclasses de forma nativa: sin pasar por to_dict()
+        output_path.write_bytes(orjson.dumps(modules, option=orjson.OPT_INDENT_2))
 
     def get_module_dependencies_graph(
         self, modules: List[OdooModule]
@@ -2,10 +2,15 @@
 Loader para cargar datos en Neo4j de forma eficiente.
 Versión mejorada con logging estructurado y mejor manejo de errores.
 """
-import json
 import logging
-from typing import List, Dict, Optional
+import threading
+from itertools import count, islice
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import nullcontext
+from typing import List, Dict, Optional, Iterable, Tuple, Sequence, Union
 from neo4j import GraphDatabase, Session
+from neo4j.exceptions import ClientError
 from config import Config
 from .schema import GraphSchema
 from ..utils.logger import setup_logger
@@ -15,12 +20,51 @@ from ..utils.serialization import serialize_for_neo4j
 class Neo4jLoader:
     """Cargador de datos a Neo4j con batch processing."""
 
+    # Categorías de datos organizados que representan relaciones (fase 2)
+    RELATIONSHIP_CATEGORIES = frozenset({
+        "module_dependencies",
+        "model_module_rels",
+        "model_inheritances",
+        "model_delegations",
+        "field_model_rels",
+        "field_references",
+        "view_module_rels",
+        "view_model_rels",
+        "view_inheritances",
+    })
+
+    # Batches de nodos que se confirman juntos en una misma transacción
+    NODE_STATEMENTS_PER_TX = 4
+
+    # Atributos de campo que se guardan como propiedades propias del nodo
+    FIELD_ATTR_PREFIX = "attr_"
+    SCALAR_TYPES = (str, int, float, bool)
+
+    # Clave primaria de cada categoría de nodos
+    NODE_KEYS = {
+        "modules": ("name",),
+        "models": ("name",),
+        "views": ("xml_id",),
+        "fields": ("model_name", "field_name"),
+        "model_placeholders": ("name",),
+        "view_placeholders": ("xml_id",),
+    }
+
+    # Columnas por las que se ordenan las filas de relaciones antes de
+    # enviarlas: filas contiguas resuelven el mismo nodo en el MATCH y el
+    # servidor reutiliza las páginas ya cargadas
+    RELATIONSHIP_SORT_KEYS = {
+        "field_model_rels": ("model_name",),
+        "field_references": ("model_name", "related_model"),
+    }
+
     def __init__(
         self,
         uri: str = None,
         user: str = None,
         password: str = None,
-        log_level: int = logging.WARNING
+        log_level: int = logging.WARNING,
+        progress=None
     ):
         """
         Inicializa la conexión a Neo4j.
@@ -30,15 +74,29 @@ class Neo4jLoader:
             user: Usuario
             password: Contraseña
             log_level: Nivel de logging (por defecto WARNING para no interferir con rich)
+            progress: Barra de progreso opcional (rich.progress.Progress) donde
+                se muestra el avance de load_organized_data
         """
         self.uri = uri or Config.NEO4J_URI
         self.user = user or Config.NEO4J_USER
         self.password = password or Config.NEO4J_PASSWORD
         self.batch_size = Config.BATCH_SIZE
-
-        self.driver = GraphDatabase.driver(self.uri, auth=(self.user, self.password))
+        self.concurrency = max(1, Config.LOAD_CONCURRENCY)
+        self.progress = progress
+        self.bulk_load = False
+
+        self.driver = GraphDatabase.driver(
+            self.uri,
+            auth=(self.user, self.password),
+            max_connection_pool_size=Config.NEO4J_MAX_POOL_SIZE,
+        )
         self.schema = GraphSchema()
 
+        # Queries construidas una sola vez: el texto idéntico entre llamadas
+        # también permite reutilizar el plan cacheado en Neo4j
+        self._queries = self._get_organized_queries()
+        self._bulk_queries = self._get_organized_queries(bulk=True)
+
         # Logger estructurado (nivel WARNING para no interferir con rich console)
         self.logger = setup_logger(__name__, level=log_level)
 
@@ -49,6 +107,8 @@ class Neo4jLoader:
             "errors": 0,
             "batches_processed": 0
         }
+        # Las métricas se actualizan desde los hilos de carga concurrente
+        self._metrics_lock = threading.Lock()
 
     def close(self):
         """Cierra la conexión."""
@@ -64,14 +124,60 @@ class Neo4jLoader:
         self.close()
 
     def setup_schema(self):
-        """Configura constraints e índices."""
-        with self.driver.session() as session:
-            for query in self.schema.get_constraints():
+        """
+        Configura constraints e índices.
+        Cada constraint/índice afecta a una etiqueta o propiedad distinta,
+        así que se crean en paralelo (una sesión por query): el tiempo total
+        es el del índice más lento y no la suma de todos.
+        """
+        def create(query):
+            with self.driver.session() as session:
+                session.run(query).consume()
+
+        queries = self.schema.get_constraints()
+        with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+            futures = [executor.submit(create, query) for query in queries]
+            for future in futures:
                 try:
-                    session.run(query)
+                    future.result()
                 except Exception as e:
                     print(f"Warning creando constraint: {e}")
 
+    def bulk_load_mode(self, enabled: bool):
+        """
+        Activa o desactiva el modo de carga masiva.
+        Con el modo activo se eliminan las constraints de unicidad y los nodos
+        se crean con CREATE (deduplicados en Python) en lugar de MERGE, sin
+        chequeo de unicidad por fila. Al desactivarlo se recrean las
+        constraints, que construyen su índice en una sola pasada.
+        Solo debe activarse sobre un grafo vacío.
+
+        Args:
+            enabled: True para activar, False para restaurar las constraints
+        """
+        if enabled and not self.bulk_load:
+            labels = [self.schema.NODE_MODULE, self.schema.NODE_MODEL, self.schema.NODE_VIEW]
+            with self.driver.session() as session:
+                result = session.run(
+                    "SHOW CONSTRAINTS YIELD name, type, labelsOrTypes "
+                    "WHERE type CONTAINS 'UNIQUENESS' "
+                    "AND any(label IN labelsOrTypes WHERE label IN $labels) "
+                    "RETURN name",
+                    labels=labels,
+                )
+                names = [record["name"] for record in result]
+                for name in names:
+                    session.run(f"DROP CONSTRAINT `{name}` IF EXISTS")
+            self.logger.info(f"Bulk load mode: {len(names)} constraints eliminadas")
+
+        elif not enabled and self.bulk_load:
+            self.setup_schema()
+            with self.driver.session() as session:
+                session.run("CALL db.awaitIndexes()").consume()
+            self.logger.info("Bulk load mode: constraints recreadas")
+
+        self.bulk_load = enabled
+
     def clear_graph(self):
         """Limpia todo el grafo."""
         with self.driver.session() as session:
@@ -85,17 +191,7 @@ class Neo4jLoader:
         Args:
             modules: Lista de diccionarios con datos de módulos
         """
-        query = f"""
-        UNWIND $modules AS module
-        MERGE (m:{self.schema.NODE_MODULE} {{name: module.name}})
-        SET m.version = module.version,
-            m.description = module.description,
-            m.author = module.author,
-            m.category = module.category,
-            m.path = module.path,
-            m.installable = module.installable,
-            m.auto_install = module.auto_install
-        """
+        query = self._queries["modules"][0]
 
         self._batch_execute(query, modules, "modules", "módulos")
 
@@ -104,226 +200,338 @@ class Neo4jLoader:
 
     def _load_module_dependencies(self, modules: List[Dict]):
         """Carga relaciones de dependencia entre módulos."""
-        dependencies = []
-        for module in modules:
-            for dep in module.get("depends", []):
-                dependencies.append({"from": module["name"], "to": dep})
-
-        if not dependencies:
+        # Aristas como tuplas deduplicadas (dict.fromkeys conserva el orden);
+        # los diccionarios para UNWIND se arman solo al final
+        edges = dict.fromkeys(
+            (module["name"], dep)
+            for module in modules
+            for dep in module.get("depends", ())
+        )
+        if not edges:
             return
 
-        query = f"""
-        UNWIND $deps AS dep
-        MATCH (m1:{self.schema.NODE_MODULE} {{name: dep.from}})
-        MATCH (m2:{self.schema.NODE_MODULE} {{name: dep.to}})
-        MERGE (m1)-[:{self.schema.REL_MODULE_DEPENDS}]->(m2)
-        """
+        # Columnar: dos tuplas paralelas en lugar de un dict por arista
+        sources, targets = zip(*edges)
+        dependencies = {"from": sources, "to": targets}
+
+        query = self._queries["module_dependencies"][0]
 
         self._batch_execute(query, dependencies, "deps", "dependencias de módulos")
 
-    def load_organized_data(self, data: Dict):
+    def _get_organized_queries(self, bulk: bool = False) -> Dict[str, Tuple[str, str, str]]:
         """
-        Carga datos pre-organizados en orden óptimo.
-        Patrón ETL: Los datos ya están extraídos y transformados,
-        solo falta cargarlos en el orden correcto.
+        Queries de carga por categoría de datos organizados.
 
         Args:
-            data: Diccionario con datos organizados por tipo
-        """
-        import time
-
-        print("\n[FASE 1: NODOS] Creando nodos sin relaciones...")
-        start = time.time()
+            bulk: Crear los nodos con CREATE en lugar de MERGE (modo carga masiva)
 
-        # 1. Módulos (base de todo)
-        print(f"\n→ Cargando {len(data['modules'])} módulos...")
-        query = f"""
-        UNWIND $modules AS module
-        MERGE (m:{self.schema.NODE_MODULE} {{name: module.name}})
-        SET m.version = module.version,
-            m.description = module.description,
-            m.author = module.author,
-            m.category = module.category,
-            m.path = module.path,
-            m.installable = module.installable,
-            m.auto_install = module.auto_install
-        """
-        self._batch_execute(query, data["modules"], "modules", "módulos")
-
-        # 2. Modelos (independientes)
-        print(f"\n→ Cargando {len(data['models'])} modelos...")
-        query = f"""
-        UNWIND $models AS model
-        MERGE (m:{self.schema.NODE_MODEL} {{name: model.name}})
-        SET m.description = model.description,
-            m.module = model.module,
-            m.file_path = model.file_path,
-            m.class_name = model.class_name,
-            m.model_type = model.model_type,
-            m.is_abstract = model.is_abstract,
-            m.is_extension = model.is_extension,
-            m.is_transient = model.is_transient
-        """
-        self._batch_execute(query, data["models"], "models", "modelos")
-
-        # 3. Vistas (independientes)
-        print(f"\n→ Cargando {len(data['views'])} vistas...")
-        query = f"""
-        UNWIND $views AS view
-        MERGE (v:{self.schema.NODE_VIEW} {{xml_id: view.xml_id}})
-        SET v.name = view.name,
-            v.model = view.model,
-            v.view_type = view.view_type,
-            v.module = view.module,
-            v.file_path = view.file_path,
-            v.priority = view.priority
-        """
-        self._batch_execute(query, data["views"], "views", "vistas")
-
-        # 4. Campos (independientes - sin related_model aún)
-        print(f"\n→ Cargando {len(data['fields'])} campos...")
-        query = f"""
-        UNWIND $fields AS field
-        MERGE (f:{self.schema.NODE_FIELD} {{model: field.model_name, name: field.field_name}})
-        SET f.field_type = field.field_type,
-            f.attributes = field.attributes
+        Returns:
+            Diccionario categoría -> (query, nombre del parámetro, descripción)
         """
-        # Convertir attributes a JSON
-        fields_with_json = []
-        for field in data["fields"]:
-            field_copy = field.copy()
-            field_copy["attributes"] = json.dumps(field.get("attributes", {}))
-            fields_with_json.append(field_copy)
-
-        self._batch_execute(query, fields_with_json, "fields", "campos")
-
-        nodes_time = time.time() - start
-        print(f"\n✓ Nodos creados en {nodes_time:.2f}s\n")
-
-        print("[FASE 2: RELACIONES] Creando relaciones entre nodos...")
-        start = time.time()
-
-        # 5. Dependencias de módulos
-        if data["module_dependencies"]:
-            print(f"\n→ Creando {len(data['module_dependencies'])} dependencias de módulos...")
-            query = f"""
+        write = "CREATE" if bulk else "MERGE"
+        return {
+            # ===== Nodos =====
+            "modules": (f"""
+            UNWIND $modules AS module
+            {write} (m:{self.schema.NODE_MODULE} {{name: module.name}})
+            SET m.version = module.version,
+                m.description = module.description,
+                m.author = module.author,
+                m.category = module.category,
+                m.path = module.path,
+                m.installable = module.installable,
+                m.auto_install = module.auto_install
+            """, "modules", "módulos"),
+            "models": (f"""
+            UNWIND $models AS model
+            {write} (m:{self.schema.NODE_MODEL} {{name: model.name}})
+            SET m.description = model.description,
+                m.module = model.module,
+                m.file_path = model.file_path,
+                m.class_name = model.class_name,
+                m.model_type = model.model_type,
+                m.is_abstract = model.is_abstract,
+                m.is_extension = model.is_extension,
+                m.is_transient = model.is_transient
+            """, "models", "modelos"),
+            "views": (f"""
+            UNWIND $views AS view
+            {write} (v:{self.schema.NODE_VIEW} {{xml_id: view.xml_id}})
+            SET v.name = view.name,
+                v.model = view.model,
+                v.view_type = view.view_type,
+                v.module = view.module,
+                v.file_path = view.file_path,
+                v.priority = view.priority
+            """, "views", "vistas"),
+            "fields": (f"""
+            UNWIND $fields AS field
+            {write} (f:{self.schema.NODE_FIELD} {{model: field.model_name, name: field.field_name}})
+            SET f.field_type = field.field_type,
+                f.attributes = field.attributes,
+                f += field.props
+            """, "fields", "campos"),
+            "model_placeholders": (f"""
+            UNWIND $parents AS parent
+            {write} (:{self.schema.NODE_MODEL} {{name: parent.name}})
+            """, "parents", "modelos referenciados"),
+            "view_placeholders": (f"""
+            UNWIND $parents AS parent
+            {write} (:{self.schema.NODE_VIEW} {{xml_id: parent.xml_id}})
+            """, "parents", "vistas referenciadas"),
+            # ===== Relaciones =====
+            "module_dependencies": (f"""
             UNWIND $deps AS dep
             MATCH (m1:{self.schema.NODE_MODULE} {{name: dep.from}})
             MATCH (m2:{self.schema.NODE_MODULE} {{name: dep.to}})
             MERGE (m1)-[:{self.schema.REL_MODULE_DEPENDS}]->(m2)
-            """
-            self._batch_execute(query, data["module_dependencies"], "deps", "dependencias módulo")
-
-        # 6. Relaciones modelo→módulo
-        if data["model_module_rels"]:
-            print(f"\n→ Creando {len(data['model_module_rels'])} relaciones modelo→módulo...")
-            query = f"""
+            """, "deps", "dependencias módulo"),
+            "model_module_rels": (f"""
             UNWIND $rels AS rel
             MATCH (m:{self.schema.NODE_MODEL} {{name: rel.model}})
             MATCH (mod:{self.schema.NODE_MODULE} {{name: rel.module}})
             MERGE (mod)-[:{self.schema.REL_MODULE_CONTAINS_MODEL}]->(m)
-            """
-            self._batch_execute(query, data["model_module_rels"], "rels", "relaciones modelo→módulo")
-
-        # 7. Herencias de modelos
-        if data["model_inheritances"]:
-            print(f"\n→ Creando {len(data['model_inheritances'])} herencias de modelos...")
-            query = f"""
+            """, "rels", "relaciones modelo→módulo"),
+            "model_inheritances": (f"""
             UNWIND $inh AS inh
             MATCH (child:{self.schema.NODE_MODEL} {{name: inh.child}})
-            MERGE (parent:{self.schema.NODE_MODEL} {{name: inh.parent}})
+            MATCH (parent:{self.schema.NODE_MODEL} {{name: inh.parent}})
             MERGE (child)-[:{self.schema.REL_MODEL_INHERITS}]->(parent)
-            """
-            self._batch_execute(query, data["model_inheritances"], "inh", "herencias modelo")
-
-        # 8. Delegaciones de modelos
-        if data["model_delegations"]:
-            print(f"\n→ Creando {len(data['model_delegations'])} delegaciones de modelos...")
-            query = f"""
+            """, "inh", "herencias modelo"),
+            "model_delegations": (f"""
             UNWIND $dels AS del
             MATCH (child:{self.schema.NODE_MODEL} {{name: del.child}})
-            MERGE (parent:{self.schema.NODE_MODEL} {{name: del.parent}})
+            MATCH (parent:{self.schema.NODE_MODEL} {{name: del.parent}})
             MERGE (child)-[r:{self.schema.REL_MODEL_INHERITS_DELEGATION}]->(parent)
             SET r.field = del.field
-            """
-            self._batch_execute(query, data["model_delegations"], "dels", "delegaciones modelo")
-
-        # 9. Relaciones campo→modelo
-        if data["field_model_rels"]:
-            print(f"\n→ Creando {len(data['field_model_rels'])} relaciones campo→modelo...")
-            query = f"""
+            """, "dels", "delegaciones modelo"),
+            "field_model_rels": (f"""
             UNWIND $rels AS rel
             MATCH (m:{self.schema.NODE_MODEL} {{name: rel.model_name}})
             MATCH (f:{self.schema.NODE_FIELD} {{model: rel.model_name, name: rel.field_name}})
             MERGE (m)-[:{self.schema.REL_MODEL_HAS_FIELD}]->(f)
-            """
-            self._batch_execute(query, data["field_model_rels"], "rels", "relaciones campo→modelo")
-
-        # 10. Referencias de campos (Many2one, etc)
-        if data["field_references"]:
-            print(f"\n→ Creando {len(data['field_references'])} referencias de campos...")
-            query = f"""
+            """, "rels", "relaciones campo→modelo"),
+            "field_references": (f"""
             UNWIND $refs AS ref
             MATCH (f:{self.schema.NODE_FIELD} {{model: ref.model_name, name: ref.field_name}})
-            MERGE (target:{self.schema.NODE_MODEL} {{name: ref.related_model}})
+            MATCH (target:{self.schema.NODE_MODEL} {{name: ref.related_model}})
             MERGE (f)-[:{self.schema.REL_FIELD_RELATES_TO}]->(target)
-            """
-            self._batch_execute(query, data["field_references"], "refs", "referencias campo")
-
-        # 11. Relaciones vista→módulo
-        if data["view_module_rels"]:
-            print(f"\n→ Creando {len(data['view_module_rels'])} relaciones vista→módulo...")
-            query = f"""
+            """, "refs", "referencias campo"),
+            "view_module_rels": (f"""
             UNWIND $rels AS rel
             MATCH (v:{self.schema.NODE_VIEW} {{xml_id: rel.view_xml_id}})
             MATCH (mod:{self.schema.NODE_MODULE} {{name: rel.module}})
             MERGE (mod)-[:{self.schema.REL_MODULE_CONTAINS_VIEW}]->(v)
-            """
-            self._batch_execute(query, data["view_module_rels"], "rels", "relaciones vista→módulo")
-
-        # 12. Relaciones vista→modelo
-        if data["view_model_rels"]:
-            print(f"\n→ Creando {len(data['view_model_rels'])} relaciones vista→modelo...")
-            query = f"""
+            """, "rels", "relaciones vista→módulo"),
+            "view_model_rels": (f"""
             UNWIND $rels AS rel
             MATCH (v:{self.schema.NODE_VIEW} {{xml_id: rel.view_xml_id}})
             MATCH (m:{self.schema.NODE_MODEL} {{name: rel.model}})
             MERGE (v)-[:{self.schema.REL_VIEW_FOR_MODEL}]->(m)
-            """
-            self._batch_execute(query, data["view_model_rels"], "rels", "relaciones vista→modelo")
-
-        # 13. Herencias de vistas
-        if data["view_inheritances"]:
-            print(f"\n→ Creando {len(data['view_inheritances'])} herencias de vistas...")
-            query = f"""
+            """, "rels", "relaciones vista→modelo"),
+            "view_inheritances": (f"""
             UNWIND $inh AS inh
             MATCH (child:{self.schema.NODE_VIEW} {{xml_id: inh.child}})
-            MERGE (parent:{self.schema.NODE_VIEW} {{xml_id: inh.parent}})
+            MATCH (parent:{self.schema.NODE_VIEW} {{xml_id: inh.parent}})
             MERGE (child)-[:{self.schema.REL_VIEW_EXTENDS}]->(parent)
-            """
-            self._batch_execute(query, data["view_inheritances"], "inh", "herencias vista")
+            """, "inh", "herencias vista"),
+        }
+
+    def load_organized_data(
+        self, batches: Iterable[Tuple[str, Tuple[str, ...], List[Tuple]]]
+    ) -> Dict:
+        """
+        Carga datos pre-organizados en streaming.
+        Patrón ETL: los datos llegan ya extraídos, transformados y partidos en
+        batches (categoría, columnas, filas); aquí solo se despachan a la
+        query de su categoría. Las filas llegan como tuplas y se convierten a
+        diccionarios justo antes de enviarse a Neo4j. Se espera que todos los
+        nodos lleguen antes que las relaciones.
+
+        Hasta Config.LOAD_CONCURRENCY batches viajan a Neo4j en paralelo, cada
+        uno en la sesión de su hilo, para solapar la latencia de red con la
+        ejecución en el servidor. Entre fases hay una barrera: ninguna
+        relación se envía hasta que todos los nodos fueron confirmados.
+
+        Cada clave de nodo debe llegar una sola vez (iter_organized_batches
+        ya deduplica quedándose con la última aparición): los batches de
+        nodos se ejecutan en paralelo, OdooField no tiene constraint de
+        unicidad y en modo masivo CREATE no deduplica.
+
+        Args:
+            batches: Iterable de tuplas (categoría, nombres de columna,
+                lista de filas)
+
+        Returns:
+            Diccionario con 'counts' (registros cargados por categoría) y los
+            tiempos 'nodes_time', 'rels_time' y 'total_time' en segundos
+        """
+        import time
+
+        queries = self._bulk_queries if self.bulk_load else self._queries
+        counts: Dict[str, int] = {}
+        in_flight = set()
+        # Como máximo dos batches en cola por hilo: acota la memoria retenida
+        max_in_flight = self.concurrency * 2
+        # Batches de nodos pendientes de agrupar en una misma transacción
+        node_group = []
+
+        progress = self.progress
+        task = progress.add_task("Cargando nodos...", total=None) if progress else None
+        log_info = self.logger.isEnabledFor(logging.INFO)
+
+        def collect(futures):
+            for future in futures:
+                for category, processed in future.result().items():
+                    counts[category] = counts.get(category, 0) + processed
+                    if progress:
+                        progress.advance(task, processed)
+
+        def dispatch(executor, fn, *args):
+            nonlocal in_flight
+            if len(in_flight) >= max_in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+            in_flight.add(executor.submit(fn, *args))
+
+        # Una sesión por hilo del pool, abierta durante toda la carga: las
+        # sesiones no son thread-safe, pero así no se paga un handshake por batch
+        local = threading.local()
+        sessions = []
+        sessions_lock = threading.Lock()
+
+        def thread_session():
+            session = getattr(local, "session", None)
+            if session is None:
+                session = local.session = self.driver.session()
+                with sessions_lock:
+                    sessions.append(session)
+            return session
+
+        def execute_nodes(statements):
+            return self._execute_statements(statements, session=thread_session())
+
+        def execute_relationship(category, query, batch, param_name, description):
+            session = thread_session()
+            if Config.USE_APOC:
+                result = self._apoc_execute(query, batch, param_name, description, session)
+            else:
+                result = self._batch_execute(query, batch, param_name, description, session)
+            return {category: result["processed"]}
+
+        def send(executor, category, header, rows):
+            nonlocal node_group
+            query, param_name, description = queries[category]
+
+            sort_columns = self.RELATIONSHIP_SORT_KEYS.get(category)
+            if sort_columns:
+                rows = sorted(
+                    rows, key=itemgetter(*(header.index(c) for c in sort_columns))
+                )
+
+            if category in self.NODE_KEYS:
+                # Sin claves None: en Cypher una clave ausente ya evalúa a
+                # null, así que el resultado es el mismo y el payload Bolt
+                # es más chico en filas dispersas
+                batch = [
+                    {key: value for key, value in zip(header, row) if value is not None}
+                    for row in rows
+                ]
+            else:
+                batch = [dict(zip(header, row)) for row in rows]
+
+            if category == "fields":
+                for field in batch:
+                    field["props"], field["attributes"] = self._split_field_attributes(
+                        field["attributes"]
+                    )
 
-        rels_time = time.time() - start
-        total_time = nodes_time + rels_time
+            if nodes_time is None:
+                # Fase de nodos: varios UNWIND por commit
+                node_group.append((category, query, param_name, batch))
+                if len(node_group) >= self.NODE_STATEMENTS_PER_TX:
+                    dispatch(executor, execute_nodes, node_group)
+                    node_group = []
+            else:
+                dispatch(
+                    executor, execute_relationship,
+                    category, query, batch, param_name, description
+                )
 
-        print(f"\n✓ Relaciones creadas en {rels_time:.2f}s")
-        print(f"\n{'='*60}")
-        print(f"RESUMEN DE CARGA:")
-        print(f"  • Tiempo nodos: {nodes_time:.2f}s")
-        print(f"  • Tiempo relaciones: {rels_time:.2f}s")
-        print(f"  • Tiempo total: {total_time:.2f}s")
-        print(f"{'='*60}\n")
+        if log_info:
+            self.logger.info("FASE 1: creando nodos sin relaciones")
+        start = time.time()
+        nodes_time = None
 
-    def load_models(self, models: List[Dict]):
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                for category, header, rows in batches:
+                    if nodes_time is None and category in self.RELATIONSHIP_CATEGORIES:
+                        if node_group:
+                            dispatch(executor, execute_nodes, node_group)
+                            node_group = []
+                        # Barrera: los MATCH de relaciones necesitan los nodos creados
+                        collect(in_flight)
+                        in_flight = set()
+                        if self.bulk_load:
+                            # Los MATCH de la fase 2 necesitan los índices
+                            self.bulk_load_mode(False)
+                        nodes_time = time.time() - start
+                        if log_info:
+                            self.logger.info(f"Nodos creados en {nodes_time:.2f}s")
+                            self.logger.info("FASE 2: creando relaciones entre nodos")
+                        if progress:
+                            progress.update(task, description="Cargando relaciones...")
+                        start = time.time()
+
+                    send(executor, category, header, rows)
+
+                if node_group:
+                    dispatch(executor, execute_nodes, node_group)
+                collect(in_flight)
+        finally:
+            for session in sessions:
+                session.close()
+
+            if self.bulk_load:
+                # Carga fallida o sin relaciones: restaurar igualmente las
+                # constraints para no dejar el grafo sin índices de unicidad
+                self.bulk_load_mode(False)
+
+        if nodes_time is None:
+            nodes_time = time.time() - start
+            rels_time = 0.0
+        else:
+            rels_time = time.time() - start
+        if log_info:
+            self.logger.info(f"Relaciones creadas en {rels_time:.2f}s")
+        if progress:
+            progress.update(task, description="Carga en Neo4j", total=sum(counts.values()))
+
+        return {
+            "counts": counts,
+            "nodes_time": nodes_time,
+            "rels_time": rels_time,
+            "total_time": nodes_time + rels_time,
+        }
+
+    def load_models(self, models: Iterable[Dict]):
         """
         Carga modelos en el grafo.
 
         Args:
-            models: Lista de diccionarios con datos de modelos
+            models: Diccionarios con datos de modelos (cualquier iterable)
         """
         # Filtrar modelos inválidos (sin nombre)
-        valid_models = [m for m in models if m.get("name")]
-        invalid_count = len(models) - len(valid_models)
+        # Una sola pasada: sirve también para iterables que no se pueden
+        # recorrer dos veces (generadores)
+        valid_models = []
+        invalid_count = 0
+        for model in models:
+            if model.get("name"):
+                valid_models.append(model)
+            else:
+                invalid_count += 1
 
         if invalid_count > 0:
             print(f"Warning: {invalid_count} modelos sin nombre válido fueron descartados")
@@ -332,31 +540,15 @@ class Neo4jLoader:
             print("Warning: No hay modelos válidos para cargar")
             return
 
-        # Primero crear nodos de modelos (sin relaciones)
-        query = f"""
-        UNWIND $models AS model
-        MERGE (m:{self.schema.NODE_MODEL} {{name: model.name}})
-        SET m.description = model.description,
-            m.module = model.module,
-            m.file_path = model.file_path,
-            m.class_name = model.class_name,
-            m.model_type = model.model_type,
-            m.is_abstract = model.is_abstract,
-            m.is_extension = model.is_extension,
-            m.is_transient = model.is_transient
-        """
-
-        self._batch_execute(query, valid_models, "models", "nodos de modelos")
-
-        # Crear relaciones módulo->modelo en query separada (más rápido)
-        rel_query = f"""
-        UNWIND $models AS model
-        MATCH (m:{self.schema.NODE_MODEL} {{name: model.name}})
+        # Nodo y relación módulo->modelo en una sola query: el payload viaja
+        # una vez y cada fila resuelve ambos MERGE en la misma transacción
+        query = self._queries["models"][0] + f"""
+        WITH m, model
         MATCH (mod:{self.schema.NODE_MODULE} {{name: model.module}})
         MERGE (mod)-[:{self.schema.REL_MODULE_CONTAINS_MODEL}]->(m)
         """
 
-        self._batch_execute(rel_query, valid_models, "models", "relaciones módulo→modelo")
+        self._batch_execute(query, valid_models, "models", "modelos y relaciones módulo→modelo")
 
         # Cargar herencias
         self._load_model_inheritance(valid_models)
@@ -364,36 +556,68 @@ class Neo4jLoader:
         # Cargar campos
         self._load_model_fields(valid_models)
 
+    def _merge_placeholders(self, label: str, key: str, names: Iterable[str], description: str):
+        """
+        Crea una sola vez los nodos referenciados (padres, destinos) que no
+        forman parte de la carga, para que las relaciones usen MATCH.
+
+        Args:
+            label: Etiqueta del nodo
+            key: Propiedad identificadora del nodo
+            names: Valores de la propiedad identificadora
+            description: Descripción para el contador de progreso
+        """
+        parents = [{key: name} for name in names]
+        if not parents:
+            return
+
+        query = f"""
+        UNWIND $parents AS parent
+        MERGE (:{label} {{{key}: parent.{key}}})
+        """
+        self._batch_execute(query, parents, "parents", description)
+
     def _load_model_inheritance(self, models: List[Dict]):
         """Carga relaciones de herencia entre modelos."""
+        # Aristas deduplicadas en formato columnar (una tupla por atributo)
         # Herencia simple (_inherit)
-        inheritances = []
-        for model in models:
-            for parent in model.get("inherits", []):
-                inheritances.append({"child": model["name"], "parent": parent})
+        edges = dict.fromkeys(
+            (model["name"], parent)
+            for model in models
+            for parent in model.get("inherits", ())
+        )
+        inheritances = dict(zip(("child", "parent"), zip(*edges)))
+
+        # Herencia por delegación (_inherits)
+        edges = dict.fromkeys(
+            (model["name"], parent, field)
+            for model in models
+            for parent, field in model.get("inherits_models", {}).items()
+        )
+        delegations = dict(zip(("child", "parent", "field"), zip(*edges)))
+
+        # Padres que no están entre los modelos cargados
+        parents = set(inheritances.get("parent", ()))
+        parents.update(delegations.get("parent", ()))
+        parents.difference_update(model["name"] for model in models)
+        self._merge_placeholders(
+            self.schema.NODE_MODEL, "name", parents, "modelos padre referenciados"
+        )
 
         if inheritances:
             query = f"""
             UNWIND $inherits AS inh
             MATCH (child:{self.schema.NODE_MODEL} {{name: inh.child}})
-            MERGE (parent:{self.schema.NODE_MODEL} {{name: inh.parent}})
+            MATCH (parent:{self.schema.NODE_MODEL} {{name: inh.parent}})
             MERGE (child)-[:{self.schema.REL_MODEL_INHERITS}]->(parent)
             """
             self._batch_execute(query, inheritances, "inherits", "herencias de modelos (_inherit)")
 
-        # Herencia por delegación (_inherits)
-        delegations = []
-        for model in models:
-            for parent, field in model.get("inherits_models", {}).items():
-                delegations.append(
-                    {"child": model["name"], "parent": parent, "field": field}
-                )
-
         if delegations:
             query = f"""
             UNWIND $dels AS del
             MATCH (child:{self.schema.NODE_MODEL} {{name: del.child}})
-            MERGE (parent:{self.schema.NODE_MODEL} {{name: del.parent}})
+            MATCH (parent:{self.schema.NODE_MODEL} {{name: del.parent}})
             MERGE (child)-[r:{self.schema.REL_MODEL_INHERITS_DELEGATION}]->(parent)
             SET r.field = del.field
             """
@@ -401,33 +625,27 @@ class Neo4jLoader:
 
     def _load_model_fields(self, models: List[Dict]):
         """Carga campos de modelos y sus relaciones."""
-        fields_data = []
-
-        for model in models:
-            for field in model.get("fields", []):
-                # Convertir attributes dict a JSON string para Neo4j
-                attributes = field.get("attributes", {})
-                attributes_json = json.dumps(attributes) if attributes else "{}"
-
-                field_data = {
-                    "model_name": model["name"],
-                    "field_name": field["name"],
-                    "field_type": field["field_type"],
-                    "related_model": field.get("related_model"),
-                    "attributes": attributes_json,
-                }
-                fields_data.append(field_data)
+        fields_data = [
+            {
+                "model_name": model["name"],
+                "field_name": field["name"],
+                "field_type": field["field_type"],
+                "related_model": field.get("related_model"),
+                "attributes": field.get("attributes"),
+            }
+            for model in models
+            for field in model.get("fields", ())
+        ]
+        for field in fields_data:
+            field["props"], field["attributes"] = self._split_field_attributes(
+                field["attributes"]
+            )
 
         if not fields_data:
             return
 
         # Crear nodos de campos (sin relaciones)
-        query = f"""
-        UNWIND $fields AS field
-        MERGE (f:{self.schema.NODE_FIELD} {{model: field.model_name, name: field.field_name}})
-        SET f.field_type = field.field_type,
-            f.attributes = field.attributes
-        """
+        query = self._queries["fields"][0]
 
         self._batch_execute(query, fields_data, "fields", "nodos de campos")
 
@@ -445,24 +663,35 @@ class Neo4jLoader:
         relational_fields = [f for f in fields_data if f["related_model"]]
 
         if relational_fields:
+            targets = {f["related_model"] for f in relational_fields}
+            targets.difference_update(model["name"] for model in models)
+            self._merge_placeholders(
+                self.schema.NODE_MODEL, "name", targets, "modelos destino referenciados"
+            )
+
             query = f"""
             UNWIND $fields AS field
             MATCH (f:{self.schema.NODE_FIELD} {{model: field.model_name, name: field.field_name}})
-            MERGE (target:{self.schema.NODE_MODEL} {{name: field.related_model}})
+            MATCH (target:{self.schema.NODE_MODEL} {{name: field.related_model}})
             MERGE (f)-[:{self.schema.REL_FIELD_RELATES_TO}]->(target)
             """
             self._batch_execute(query, relational_fields, "fields", "relaciones campo→modelo (Many2one, etc)")
 
-    def load_views(self, views: List[Dict]):
+    def load_views(self, views: Iterable[Dict]):
         """
         Carga vistas en el grafo.
 
         Args:
-            views: Lista de diccionarios con datos de vistas
+            views: Diccionarios con datos de vistas (cualquier iterable)
         """
         # Filtrar vistas inválidas (sin xml_id o model)
-        valid_views = [v for v in views if v.get("xml_id") and v.get("model")]
-        invalid_count = len(views) - len(valid_views)
+        valid_views = []
+        invalid_count = 0
+        for view in views:
+            if view.get("xml_id") and view.get("model"):
+                valid_views.append(view)
+            else:
+                invalid_count += 1
 
         if invalid_count > 0:
             print(f"Warning: {invalid_count} vistas sin xml_id o model válido fueron descartadas")
@@ -471,39 +700,24 @@ class Neo4jLoader:
             print("Warning: No hay vistas válidas para cargar")
             return
 
-        # Crear nodos de vistas (sin relaciones)
-        query = f"""
-        UNWIND $views AS view
-        MERGE (v:{self.schema.NODE_VIEW} {{xml_id: view.xml_id}})
-        SET v.name = view.name,
-            v.model = view.model,
-            v.view_type = view.view_type,
-            v.module = view.module,
-            v.file_path = view.file_path,
-            v.priority = view.priority
-        """
-
-        self._batch_execute(query, valid_views, "views", "nodos de vistas")
-
-        # Crear relaciones módulo->vista
-        rel_module_query = f"""
-        UNWIND $views AS view
-        MATCH (v:{self.schema.NODE_VIEW} {{xml_id: view.xml_id}})
-        MATCH (mod:{self.schema.NODE_MODULE} {{name: view.module}})
-        MERGE (mod)-[:{self.schema.REL_MODULE_CONTAINS_VIEW}]->(v)
-        """
-
-        self._batch_execute(rel_module_query, valid_views, "views", "relaciones módulo→vista")
-
-        # Crear relaciones vista->modelo
-        rel_model_query = f"""
-        UNWIND $views AS view
-        MATCH (v:{self.schema.NODE_VIEW} {{xml_id: view.xml_id}})
-        MATCH (m:{self.schema.NODE_MODEL} {{name: view.model}})
-        MERGE (v)-[:{self.schema.REL_VIEW_FOR_MODEL}]->(m)
+        # Nodo y relaciones módulo->vista y vista->modelo en una sola query.
+        # Cada relación va en su propio subquery para que un MATCH sin
+        # resultado no descarte la fila de la otra
+        query = self._queries["views"][0] + f"""
+        WITH v, view
+        CALL {{
+            WITH v, view
+            MATCH (mod:{self.schema.NODE_MODULE} {{name: view.module}})
+            MERGE (mod)-[:{self.schema.REL_MODULE_CONTAINS_VIEW}]->(v)
+        }}
+        CALL {{
+            WITH v, view
+            MATCH (m:{self.schema.NODE_MODEL} {{name: view.model}})
+            MERGE (v)-[:{self.schema.REL_VIEW_FOR_MODEL}]->(m)
+        }}
         """
 
-        self._batch_execute(rel_model_query, valid_views, "views", "relaciones vista→modelo")
+        self._batch_execute(query, valid_views, "views", "vistas y sus relaciones")
 
         # Cargar herencias de vistas
         self._load_view_inheritance(valid_views)
@@ -520,72 +734,264 @@ class Neo4jLoader:
         if not inheritances:
             return
 
+        parents = {inh["parent"] for inh in inheritances}
+        parents.difference_update(view["xml_id"] for view in views)
+        self._merge_placeholders(
+            self.schema.NODE_VIEW, "xml_id", parents, "vistas padre referenciadas"
+        )
+
         query = f"""
         UNWIND $inherits AS inh
         MATCH (child:{self.schema.NODE_VIEW} {{xml_id: inh.child}})
-        MERGE (parent:{self.schema.NODE_VIEW} {{xml_id: inh.parent}})
+        MATCH (parent:{self.schema.NODE_VIEW} {{xml_id: inh.parent}})
         MERGE (child)-[:{self.schema.REL_VIEW_EXTENDS}]->(parent)
         """
 
         self._batch_execute(query, inheritances, "inherits", "herencias de vistas (inherit_id)")
 
-    def _batch_execute(
+    @classmethod
+    def _split_field_attributes(cls, attributes: Optional[Dict]) -> Tuple[Dict, str]:
+        """
+        Separa los atributos de un campo en propiedades escalares y JSON.
+        Los valores escalares se guardan como propiedades propias del nodo
+        (prefijo FIELD_ATTR_PREFIX), consultables desde Cypher sin
+        deserializar; solo los valores compuestos (listas, dicts, dominios)
+        quedan en la propiedad JSON 'attributes'.
+
+        Args:
+            attributes: Atributos del campo
+
+        Returns:
+            Tupla (propiedades escalares, JSON de los atributos compuestos)
+        """
+        if not attributes:
+            return {}, "{}"
+
+        props = {}
+        complex_attrs = {}
+        for key, value in attributes.items():
+            if isinstance(value, cls.SCALAR_TYPES):
+                props[cls.FIELD_ATTR_PREFIX + key] = value
+            elif value is not None:
+                complex_attrs[key] = value
+
+        # Mismo serializador que el resto de las propiedades: acepta claves no
+        # string (None en {**ctx}, enteros en states={1: ...})
+        return props, serialize_for_neo4j(complex_attrs) if complex_attrs else "{}"
+
+    def _session_scope(self, session: Optional[Session] = None):
+        """
+        Contexto de sesión: reutiliza la sesión recibida (sin cerrarla) o
+        abre una nueva que se cierra al salir.
+
+        Args:
+            session: Sesión existente opcional
+
+        Returns:
+            Context manager que entrega la sesión
+        """
+        if session is not None:
+            return nullcontext(session)
+        return self.driver.session()
+
+    def _apoc_execute(
         self,
         query: str,
         data: List[Dict],
         param_name: str,
-        description: str = "items"
+        description: str = "items",
+        session: Optional[Session] = None
+    ) -> Dict[str, int]:
+        """
+        Ejecuta una query UNWIND con apoc.periodic.iterate.
+        El batch viaja una sola vez y el servidor lo parte en lotes de
+        Config.APOC_BATCH_SIZE que procesa en paralelo con su propio pool de
+        workers (con reintentos ante conflictos de locks).
+
+        Args:
+            query: Query Cypher con la forma "UNWIND $param AS alias ..."
+            data: Registros a procesar
+            param_name: Nombre del parámetro en la query
+            description: Descripción para el contador de progreso
+            session: Sesión a reutilizar (por defecto se abre una nueva)
+
+        Returns:
+            Diccionario con métricas de la operación
+        """
+        if not data:
+            return {"processed": 0, "errors": 0}
+
+        # Separar "UNWIND $param AS alias" del cuerpo que procesa cada fila
+        unwind, action = query.strip().split("\n", 1)
+        alias = unwind.split()[-1]
+
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(f"Cargando {len(data)} {description} con APOC")
+
+        with self._session_scope(session) as session:
+            record = session.run(
+                """
+                CALL apoc.periodic.iterate($iterate, $action, {
+                    batchSize: $batch_size,
+                    parallel: true,
+                    retries: 3,
+                    params: $params
+                })
+                YIELD committedOperations, failedOperations, errorMessages
+                RETURN committedOperations, failedOperations, errorMessages
+                """,
+                iterate=f"UNWIND ${param_name} AS {alias} RETURN {alias}",
+                action=action,
+                batch_size=Config.APOC_BATCH_SIZE,
+                params={param_name: data},
+            ).single()
+
+        processed = record["committedOperations"]
+        errors = record["failedOperations"]
+        with self._metrics_lock:
+            self.metrics["batches_processed"] += 1
+            if errors:
+                self.metrics["errors"] += 1
+        if errors:
+            self.logger.error(
+                f"APOC: {errors} registros de {description} fallaron: {record['errorMessages']}"
+            )
+
+        return {"processed": processed, "errors": errors}
+
+    def _execute_statements(
+        self,
+        statements: List[Tuple[str, str, str, List[Dict]]],
+        session: Optional[Session] = None
+    ) -> Dict[str, int]:
+        """
+        Ejecuta varias queries UNWIND en una sola transacción administrada.
+        El costo de commit es en buena parte fijo, así que agrupar los
+        batches de nodos reduce la cantidad de commits de la fase 1.
+
+        Args:
+            statements: Lista de tuplas (categoría, query, param_name, batch)
+            session: Sesión a reutilizar (por defecto se abre una nueva)
+
+        Returns:
+            Diccionario categoría -> registros procesados
+        """
+        def work(tx):
+            for _, query, param_name, batch in statements:
+                tx.run(query, {param_name: batch}).consume()
+
+        total_items = sum(len(batch) for *_, batch in statements)
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(
+                f"Cargando {total_items} nodos en {len(statements)} batches (1 transacción)"
+            )
+
+        processed: Dict[str, int] = {}
+        try:
+            with self._session_scope(session) as session:
+                session.execute_write(work)
+        except ClientError as e:
+            with self._metrics_lock:
+                self.metrics["errors"] += 1
+            self.logger.error(f"Error en transacción de nodos ({total_items} registros): {str(e)}")
+            return processed
+
+        with self._metrics_lock:
+            self.metrics["batches_processed"] += len(statements)
+        for category, _, _, batch in statements:
+            processed[category] = processed.get(category, 0) + len(batch)
+        return processed
+
+    def _batch_execute(
+        self,
+        query: str,
+        data: Union[Iterable[Dict], Dict[str, Sequence]],
+        param_name: str,
+        description: str = "items",
+        session: Optional[Session] = None
     ) -> Dict[str, int]:
         """
         Ejecuta una query en batches para optimizar performance.
         Hace commit cada batch para evitar transacciones demasiado grandes.
+        Los batches rechazados por el servidor (ClientError) se registran y
+        se omiten; los errores transitorios los reintenta el driver.
+
+        Los datos se consumen de forma incremental con islice, de modo que
+        pueden llegar desde un generador sin materializar la lista completa.
+        También se aceptan en formato columnar ({"from": [...], "to": [...]}):
+        los diccionarios por registro se arman solo para el batch en curso.
 
         Args:
             query: Query Cypher
-            data: Datos a procesar
+            data: Datos a procesar (lista, cualquier iterable o columnas)
             param_name: Nombre del parámetro en la query
             description: Descripción para el contador de progreso
+            session: Sesión a reutilizar (por defecto se abre una nueva)
 
         Returns:
             Diccionario con métricas de la operación
         """
-        if not data:
+        if isinstance(data, dict):
+            # Formato columnar: nombre de columna -> secuencia de valores
+            names = tuple(data)
+            columns = tuple(data.values())
+            total_items = len(columns[0]) if columns else 0
+            data = (dict(zip(names, row)) for row in zip(*columns))
+        else:
+            # Con un generador el total no se conoce de antemano
+            total_items = len(data) if hasattr(data, "__len__") else None
+        if total_items == 0:
             return {"processed": 0, "errors": 0}
 
-        total_items = len(data)
-        total_batches = (total_items + self.batch_size - 1) // self.batch_size
+        if total_items is not None:
+            total_batches = (total_items + self.batch_size - 1) // self.batch_size
+            progress_step = max(1, total_batches // 10)
+        else:
+            total_batches = "?"
+            progress_step = 10
         errors = 0
         processed = 0
 
-        print(f"  Cargando {total_items} {description} en {total_batches} batches...")
-        self.logger.info(f"Starting batch operation: {description} ({total_items} items, {total_batches} batches)")
+        # El progreso solo se formatea si el logger lo va a emitir
+        log_info = self.logger.isEnabledFor(logging.INFO)
+        if log_info:
+            self.logger.info(f"Starting batch operation: {description} ({total_items} items, {total_batches} batches)")
 
-        with self.driver.session() as session:
+        items = iter(data)
+        with self._session_scope(session) as session:
             # Ejecutar cada batch en su propia transacción
             # Esto evita bloqueos con datasets grandes
-            for batch_num, i in enumerate(range(0, len(data), self.batch_size), 1):
-                batch = data[i : i + self.batch_size]
+            for batch_num in count(1):
+                batch = list(islice(items, self.batch_size))
+                if not batch:
+                    break
 
                 try:
-                    with session.begin_transaction() as tx:
-                        result = tx.run(query, {param_name: batch})
-                        tx.commit()
-                        processed += len(batch)
+                    # Transacción administrada: el driver reintenta los errores
+                    # transitorios (deadlocks, cambio de líder) antes de fallar
+                    session.execute_write(
+                        lambda tx, b=batch: tx.run(query, {param_name: b}).consume()
+                    )
+                    processed += len(batch)
+                    with self._metrics_lock:
                         self.metrics["batches_processed"] += 1
 
-                except Exception as e:
+                except ClientError as e:
                     errors += len(batch)
-                    self.metrics["errors"] += 1
+                    with self._metrics_lock:
+                        self.metrics["errors"] += 1
                     self.logger.error(
                         f"Error en batch {batch_num}/{total_batches} de {description}: {str(e)}"
                     )
                     # Continuar con el siguiente batch en lugar de fallar completamente
                     continue
 
-                # Mostrar progreso cada 10% o cada batch si son pocos
-                if batch_num % max(1, total_batches // 10) == 0 or batch_num == total_batches:
-                    progress_pct = (batch_num / total_batches) * 100
-                    print(f"    {description}: {batch_num}/{total_batches} batches ({progress_pct:.0f}%)")
+                # Registrar progreso cada 10% o cada batch si son pocos
+                if log_info and (batch_num % progress_step == 0 or batch_num == total_batches):
+                    self.logger.info(f"{description}: {batch_num}/{total_batches} batches ({processed} registros)")
+
+        if total_items is None:
+            total_items = processed + errors
 
         if errors > 0:
             self.logger.warning(f"Completed {description} with {errors} errors out of {total_items} items")
@@ -603,26 +1009,17 @@ class Neo4jLoader:
         """
         try:
             with self.driver.session() as session:
-                # Queries separadas para evitar producto cartesiano
-                stats = {}
-
-                # Contar módulos
-                result = session.run(f"MATCH (n:{self.schema.NODE_MODULE}) RETURN count(n) as count")
-                stats["modules"] = result.single()["count"]
-
-                # Contar modelos
-                result = session.run(f"MATCH (n:{self.schema.NODE_MODEL}) RETURN count(n) as count")
-                stats["models"] = result.single()["count"]
-
-                # Contar vistas
-                result = session.run(f"MATCH (n:{self.schema.NODE_VIEW}) RETURN count(n) as count")
-                stats["views"] = result.single()["count"]
-
-                # Contar campos
-                result = session.run(f"MATCH (n:{self.schema.NODE_FIELD}) RETURN count(n) as count")
-                stats["fields"] = result.single()["count"]
-
-                return stats
+                # Un subquery por etiqueta (evita el producto cartesiano) en un
+                # solo round-trip; cada count(n) se resuelve desde el count store
+                record = session.run(f"""
+                CALL {{ MATCH (n:{self.schema.NODE_MODULE}) RETURN count(n) AS modules }}
+                CALL {{ MATCH (n:{self.schema.NODE_MODEL}) RETURN count(n) AS models }}
+                CALL {{ MATCH (n:{self.schema.NODE_VIEW}) RETURN count(n) AS views }}
+                CALL {{ MATCH (n:{self.schema.NODE_FIELD}) RETURN count(n) AS fields }}
+                RETURN modules, models, views, fields
+                """).single()
+
+                return dict(record)
         except Exception as e:
             print(f"Warning: No se pudieron obtener estadísticas: {e}")
             return {
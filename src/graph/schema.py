@@ -84,6 +84,8 @@ class GraphSchema:
             f"CREATE INDEX IF NOT EXISTS FOR (m:{cls.NODE_MODEL}) ON (m.module)",
             f"CREATE INDEX IF NOT EXISTS FOR (v:{cls.NODE_VIEW}) ON (v.model)",
             f"CREATE INDEX IF NOT EXISTS FOR (f:{cls.NODE_FIELD}) ON (f.field_type)",
+            # Índice compuesto: los campos se buscan siempre por (model, name)
+            f"CREATE INDEX IF NOT EXISTS FOR (f:{cls.NODE_FIELD}) ON (f.model, f.name)",
         ]
 
     @classmethod
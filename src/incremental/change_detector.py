@@ -2,8 +2,9 @@
 Detector de cambios en módulos Odoo.
 """
 from pathlib import Path
-from typing import Set, List, Dict
+from typing import Set, List, Dict, Iterable, FrozenSet
 from .state_manager import StateManager
+from ..utils.filesystem import iter_source_files
 
 
 class ChangeDetector:
@@ -17,6 +18,9 @@ class ChangeDetector:
             state_manager: Gestor de estado
         """
         self.state_manager = state_manager or StateManager()
+        # Archivos relevantes por módulo (ruta resuelta -> archivos), para no
+        # recorrer el árbol otra vez al marcar los módulos como procesados
+        self._files_cache: Dict[str, FrozenSet[Path]] = {}
 
     def detect_changed_modules(self, modules: List[Dict]) -> List[Dict]:
         """
@@ -28,61 +32,57 @@ class ChangeDetector:
         Returns:
             Lista de módulos que han cambiado
         """
-        changed_modules = []
+        return self.detect_changed_modules_bulk(modules)
 
-        for module in modules:
-            module_path = Path(module["path"])
-
-            if self._has_module_changed(module_path):
-                changed_modules.append(module)
-
-        return changed_modules
-
-    def _has_module_changed(self, module_path: Path) -> bool:
+    def detect_changed_modules_bulk(self, modules: List[Dict]) -> List[Dict]:
         """
-        Verifica si un módulo ha cambiado.
+        Detecta módulos cambiados verificando todos sus archivos de una vez.
+
+        Junta los archivos de todos los módulos en un único conjunto (un
+        archivo compartido se verifica una sola vez), llama una sola vez a
+        get_changed_files y vuelve a los módulos con un índice inverso
+        archivo -> módulos.
 
         Args:
-            module_path: Ruta al módulo
+            modules: Lista de módulos descubiertos
 
         Returns:
-            True si el módulo cambió
+            Lista de módulos que han cambiado, en el orden original
         """
-        # Recopilar todos los archivos relevantes del módulo
-        relevant_files = self._get_relevant_files(module_path)
+        owners: Dict[Path, List[int]] = {}
+        for index, module in enumerate(modules):
+            for file_path in self._get_relevant_files(Path(module["path"])):
+                owners.setdefault(file_path, []).append(index)
+
+        changed_files = self.state_manager.get_changed_files(owners)
 
-        # Verificar si algún archivo cambió
-        changed_files = self.state_manager.get_changed_files(relevant_files)
+        changed_indexes = set()
+        for file_path in changed_files:
+            changed_indexes.update(owners[file_path])
 
-        return len(changed_files) > 0
+        return [modules[index] for index in sorted(changed_indexes)]
 
-    def _get_relevant_files(self, module_path: Path) -> Set[Path]:
+    def _get_relevant_files(self, module_path: Path) -> FrozenSet[Path]:
         """
         Obtiene todos los archivos relevantes de un módulo.
 
+        Recorre el árbol una sola vez con os.scandir (el manifest es un .py
+        más) y memoiza el resultado por módulo.
+
         Args:
             module_path: Ruta al módulo
 
         Returns:
             Conjunto de archivos relevantes
         """
-        files = set()
-
-        # Manifest
-        for manifest in ["__manifest__.py", "__openerp__.py"]:
-            manifest_path = module_path / manifest
-            if manifest_path.exists():
-                files.add(manifest_path)
-
-        # Archivos Python
-        for py_file in module_path.rglob("*.py"):
-            if "__pycache__" not in str(py_file) and "test_" not in py_file.name:
-                files.add(py_file)
-
-        # Archivos XML
-        for xml_file in module_path.rglob("*.xml"):
-            files.add(xml_file)
+        cache_key = str(module_path.resolve())
+        files = self._files_cache.get(cache_key)
+        if files is not None:
+            return files
 
+        files = self._files_cache[cache_key] = frozenset(
+            map(Path, iter_source_files(module_path, (".py", ".xml")))
+        )
         return files
 
     def get_changed_python_files(self, module_path: Path) -> Set[Path]:
@@ -95,13 +95,9 @@ class ChangeDetector:
         Returns:
             Conjunto de archivos Python modificados
         """
-        py_files = set()
-        for py_file in module_path.rglob("*.py"):
-            if "__pycache__" not in str(py_file) and "test_" not in py_file.name:
-                if self.state_manager.has_changed(py_file):
-                    py_files.add(py_file)
-
-        return py_files
+        return self.state_manager.get_changed_files(
+            f for f in self._get_relevant_files(module_path) if f.suffix == ".py"
+        )
 
     def get_changed_xml_files(self, module_path: Path) -> Set[Path]:
         """
@@ -113,12 +109,9 @@ class ChangeDetector:
         Returns:
             Conjunto de archivos XML modificados
         """
-        xml_files = set()
-        for xml_file in module_path.rglob("*.xml"):
-            if self.state_manager.has_changed(xml_file):
-                xml_files.add(xml_file)
-
-        return xml_files
+        return self.state_manager.get_changed_files(
+            f for f in self._get_relevant_files(module_path) if f.suffix == ".xml"
+        )
 
     def mark_module_processed(self, module_path: Path):
         """
@@ -127,7 +120,20 @@ class ChangeDetector:
         Args:
             module_path: Ruta al módulo
         """
-        relevant_files = self._get_relevant_files(module_path)
+        self.mark_modules_processed([module_path])
+
+    def mark_modules_processed(self, module_paths: Iterable[Path]):
+        """
+        Marca como procesados los archivos de varios módulos en una sola
+        actualización del estado.
+
+        Args:
+            module_paths: Rutas a los módulos procesados
+        """
+        relevant_files = set()
+        for module_path in module_paths:
+            relevant_files.update(self._get_relevant_files(module_path))
+
         self.state_manager.mark_files_processed(relevant_files)
 
     def get_incremental_strategy(self, modules: List[Dict]) -> Dict:
@@ -1,10 +1,15 @@
 """
 Gestión del estado para actualizaciones incrementales.
 """
-import json
 import hashlib
+import mmap
+import os
+import sqlite3
+from sys import intern
+import orjson
 from pathlib import Path
-from typing import Dict, Set
+from typing import Dict, Set, Iterable, Optional, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from config import Config
 
@@ -12,48 +17,218 @@ from config import Config
 class StateManager:
     """Gestiona el estado de archivos procesados."""
 
+    # Versión del formato del estado: al cambiar el algoritmo de hash o el
+    # formato de las entradas, los archivos guardados se descartan
+    STATE_VERSION = 3
+
+    # Tamaño a partir del cual conviene mapear el archivo en lugar de leerlo
+    MMAP_THRESHOLD = 64 * 1024
+
+    # Tamaño de chunk para la lectura secuencial cuando no se puede mapear
+    READ_CHUNK_SIZE = 256 * 1024
+
+    # hashlib suelta el GIL en update(), así que el hashing escala con hilos
+    HASH_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+    # Archivos por tanda de lectura anticipada (posix_fadvise)
+    PREFETCH_BATCH = 256
+
+    # Entradas modificadas tras las que mark_files_processed hace checkpoint
+    CHECKPOINT_INTERVAL = 5000
+
     def __init__(self, state_file: Path = None):
         """
         Inicializa el gestor de estado.
 
         Args:
-            state_file: Ruta al archivo de estado
+            state_file: Ruta a la base SQLite de estado
         """
         self.state_file = state_file or Config.STATE_FILE
         Config.ensure_cache_dir()
+        # Claves modificadas desde la última escritura: save_state solo
+        # escribe estas filas en lugar de reescribir todo el estado
+        self._dirty_files: Set[str] = set()
+        self._deleted_files: Set[str] = set()
+        self._dirty_modules: Set[str] = set()
+        self._conn = None
+        # Directorio de trabajo fijo: evita Path.absolute() por archivo
+        self._cwd = os.getcwd()
         self.state = self._load_state()
+        # Hashes ya calculados en esta ejecución (ruta absoluta -> hash)
+        self._hash_cache: Dict[str, str] = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Abre la base de estado y crea las tablas si no existen.
+
+        Returns:
+            Conexión SQLite
+        """
+        conn = sqlite3.connect(self.state_file)
+        # WAL: cada commit es atómico y no bloquea lecturas; con
+        # synchronous=NORMAL solo se sincroniza a disco en los checkpoints
+        # del WAL, no en cada transacción
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                hash TEXT NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS modules (
+                name TEXT PRIMARY KEY,
+                data BLOB NOT NULL
+            );
+            """
+        )
+        return conn
 
     def _load_state(self) -> Dict:
         """
-        Carga el estado desde el archivo.
+        Carga el estado desde la base SQLite.
 
         Returns:
             Diccionario con el estado
         """
-        if not self.state_file.exists():
-            return {
-                "last_update": None,
-                "files": {},  # path -> hash
-                "modules": {},  # module_name -> data
-            }
-
         try:
-            with open(self.state_file, "r") as f:
-                return json.load(f)
-        except Exception as e:
+            self._conn = self._connect()
+            conn = self._conn
+            meta = dict(conn.execute("SELECT key, value FROM meta"))
+
+            if meta.get("version") != str(self.STATE_VERSION):
+                # Estado de una versión anterior: forzar re-hash
+                with conn:
+                    conn.execute("DELETE FROM files")
+                    conn.execute(
+                        "INSERT OR REPLACE INTO meta VALUES ('version', ?)",
+                        (str(self.STATE_VERSION),)
+                    )
+                files = {}
+            else:
+                files = {
+                    intern(path): {"hash": file_hash, "mtime_ns": mtime_ns, "size": size}
+                    for path, file_hash, mtime_ns, size in conn.execute(
+                        "SELECT path, hash, mtime_ns, size FROM files"
+                    )
+                }
+
+            modules = {
+                name: orjson.loads(data)
+                for name, data in conn.execute("SELECT name, data FROM modules")
+            }
+        except sqlite3.DatabaseError as e:
             print(f"Error cargando estado: {e}")
-            return {"last_update": None, "files": {}, "modules": {}}
+            # Base corrupta o de otro formato: empezar de cero
+            if self._conn is not None:
+                self._conn.close()
+            self.state_file.unlink(missing_ok=True)
+            self._conn = self._connect()
+            return self._empty_state()
+
+        return {
+            "version": self.STATE_VERSION,
+            "last_update": meta.get("last_update"),
+            "files": files,
+            "modules": modules,
+        }
+
+    def _empty_state(self) -> Dict:
+        """
+        Crea un estado vacío con la versión actual.
+
+        Returns:
+            Diccionario con el estado
+        """
+        return {
+            "version": self.STATE_VERSION,
+            "last_update": None,
+            "files": {},  # path -> {hash, mtime_ns, size}
+            "modules": {},  # module_name -> data
+        }
 
     def save_state(self):
-        """Guarda el estado actual al archivo."""
+        """Escribe en la base solo las entradas modificadas, en una transacción."""
         self.state["last_update"] = datetime.now().isoformat()
+        self._flush(
+            (
+                ("version", str(self.STATE_VERSION)),
+                ("last_update", self.state["last_update"]),
+            )
+        )
+
+    def checkpoint(self):
+        """
+        Persiste las entradas modificadas hasta ahora sin cerrar la ejecución.
+
+        No toca last_update: si el proceso se corta, la próxima ejecución
+        conserva los hashes ya guardados en lugar de re-hashear todo.
+        """
+        self._flush(())
+
+    def _flush(self, meta: Iterable[Tuple[str, str]]):
+        """
+        Escribe las filas sucias (y los metadatos indicados) en una transacción.
+
+        Args:
+            meta: Pares (clave, valor) a guardar en la tabla meta
+        """
+        files_state = self.state["files"]
+        modules_state = self.state["modules"]
+
+        with self._conn as conn:
+            conn.executemany(
+                "DELETE FROM files WHERE path = ?",
+                ((path,) for path in self._deleted_files)
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)",
+                (
+                    (path, entry["hash"], entry["mtime_ns"], entry["size"])
+                    for path in self._dirty_files
+                    for entry in (files_state[path],)
+                )
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO modules VALUES (?, ?)",
+                (
+                    (name, orjson.dumps(modules_state[name]))
+                    for name in self._dirty_modules
+                )
+            )
+            conn.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)", meta)
+
+        self._deleted_files.clear()
+        self._dirty_files.clear()
+        self._dirty_modules.clear()
+
+    def _file_key(self, file_path: Union[str, os.PathLike]) -> str:
+        """
+        Obtiene la clave de estado (ruta absoluta) de un archivo.
 
-        with open(self.state_file, "w") as f:
-            json.dump(self.state, f, indent=2)
+        Args:
+            file_path: Ruta al archivo
+
+        Returns:
+            Ruta absoluta como string internado
+        """
+        path = os.fspath(file_path)
+        if not os.path.isabs(path):
+            path = os.path.join(self._cwd, path)
+        return intern(path)
 
     def get_file_hash(self, file_path: Path) -> str:
         """
-        Calcula el hash SHA256 de un archivo.
+        Calcula el hash BLAKE2b de un archivo.
+
+        El hash solo se usa para detectar cambios, así que no necesita ser
+        SHA256; BLAKE2b es más rápido por byte en CPUs de 64 bits.
 
         Args:
             file_path: Ruta al archivo
@@ -61,17 +236,91 @@ class StateManager:
         Returns:
             Hash del archivo
         """
-        sha256 = hashlib.sha256()
+        hasher = hashlib.blake2b()
 
         try:
             with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    sha256.update(chunk)
-            return sha256.hexdigest()
+                size = os.fstat(f.fileno()).st_size
+                if size < self.MMAP_THRESHOLD:
+                    # Archivos chicos: una sola lectura es más barata que mmap+munmap
+                    hasher.update(f.read())
+                    return hasher.hexdigest()
+
+                try:
+                    # Un solo update() sobre el mapeo: sin copias ni bucle por chunk
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        hasher.update(mm)
+                    return hasher.hexdigest()
+                except (OSError, ValueError):
+                    # No mapeable (pipes, /proc, etc.): lectura por chunks
+                    pass
+
+                # Buffer reutilizable de 256 KiB: pocas syscalls y update()
+                # suficientemente grandes para que hashlib suelte el GIL
+                buffer = bytearray(self.READ_CHUNK_SIZE)
+                view = memoryview(buffer)
+                readinto = f.readinto
+                update = hasher.update
+                while True:
+                    n = readinto(buffer)
+                    if not n:
+                        break
+                    update(view[:n])
+            return hasher.hexdigest()
         except Exception as e:
             print(f"Error calculando hash de {file_path}: {e}")
             return ""
 
+    def _get_cached_hash(self, file_key: str, file_path: Path) -> str:
+        """
+        Obtiene el hash de un archivo, calculándolo solo la primera vez.
+
+        Args:
+            file_key: Ruta absoluta del archivo como string
+            file_path: Ruta al archivo
+
+        Returns:
+            Hash del archivo
+        """
+        current_hash = self._hash_cache.get(file_key)
+        if current_hash is None:
+            current_hash = self._hash_cache[file_key] = self.get_file_hash(file_path)
+        return current_hash
+
+    def _get_file_entry(self, file_key: str, file_path: Path) -> Optional[Dict]:
+        """
+        Obtiene la entrada de estado actual de un archivo.
+
+        Si el tamaño y el mtime coinciden con la entrada guardada se reutiliza
+        sin leer el archivo; solo se hashea cuando los metadatos difieren.
+
+        Args:
+            file_key: Ruta absoluta del archivo como string
+            file_path: Ruta al archivo
+
+        Returns:
+            Diccionario con hash, mtime_ns y size, o None si no se pudo leer
+        """
+        try:
+            st = os.stat(file_key)
+        except OSError as e:
+            print(f"Error calculando hash de {file_path}: {e}")
+            return None
+
+        previous = self.state["files"].get(file_key)
+        if (
+            previous is not None
+            and previous["mtime_ns"] == st.st_mtime_ns
+            and previous["size"] == st.st_size
+        ):
+            return previous
+
+        current_hash = self._get_cached_hash(file_key, file_path)
+        if not current_hash:
+            return None
+
+        return {"hash": current_hash, "mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
     def has_changed(self, file_path: Path) -> bool:
         """
         Verifica si un archivo ha cambiado desde la última ejecución.
@@ -82,15 +331,15 @@ class StateManager:
         Returns:
             True si cambió o es nuevo
         """
-        file_key = str(file_path.absolute())
-        current_hash = self.get_file_hash(file_path)
+        file_key = self._file_key(file_path)
+        entry = self._get_file_entry(file_key, file_path)
 
-        if not current_hash:
+        if entry is None:
             return False
 
-        previous_hash = self.state["files"].get(file_key)
+        previous = self.state["files"].get(file_key)
 
-        return previous_hash != current_hash
+        return previous is None or previous["hash"] != entry["hash"]
 
     def update_file(self, file_path: Path):
         """
@@ -99,37 +348,126 @@ class StateManager:
         Args:
             file_path: Ruta al archivo
         """
-        file_key = str(file_path.absolute())
-        current_hash = self.get_file_hash(file_path)
-        self.state["files"][file_key] = current_hash
+        self.mark_files_processed((file_path,))
 
-    def get_changed_files(self, file_paths: Set[Path]) -> Set[Path]:
+    def get_changed_files(self, file_paths: Iterable[Path]) -> Set[Path]:
         """
         Obtiene la lista de archivos que han cambiado.
 
+        Primero se hace stat de todos los archivos y se descartan los que
+        conservan tamaño y mtime; solo el resto se hashea en el pool de
+        hilos, por tandas, pidiendo al kernel que lea por adelantado la
+        tanda siguiente mientras se hashea la actual.
+
         Args:
-            file_paths: Conjunto de rutas a verificar
+            file_paths: Rutas a verificar
 
         Returns:
             Conjunto de archivos que cambiaron
         """
-        changed = set()
-
+        files_state = self.state["files"]
+        file_key_of = self._file_key
+        pending = []
         for file_path in file_paths:
-            if self.has_changed(file_path):
-                changed.add(file_path)
+            file_key = file_key_of(file_path)
+            try:
+                st = os.stat(file_key)
+            except OSError as e:
+                print(f"Error calculando hash de {file_path}: {e}")
+                continue
+
+            previous = files_state.get(file_key)
+            if (
+                previous is not None
+                and previous["mtime_ns"] == st.st_mtime_ns
+                and previous["size"] == st.st_size
+            ):
+                continue
+            pending.append((file_path, file_key, previous))
+
+        def hash_changed(item) -> bool:
+            file_path, file_key, previous = item
+            current_hash = self._get_cached_hash(file_key, file_path)
+            return bool(current_hash) and (
+                previous is None or previous["hash"] != current_hash
+            )
+
+        if len(pending) <= 1:
+            return {item[0] for item in pending if hash_changed(item)}
+
+        changed = set()
+        batch_size = self.PREFETCH_BATCH
+        self._prefetch(file_key for _, file_key, _ in pending[:batch_size])
+
+        with ThreadPoolExecutor(max_workers=self.HASH_WORKERS) as executor:
+            for start in range(0, len(pending), batch_size):
+                batch = pending[start:start + batch_size]
+                results = executor.map(hash_changed, batch)
+                self._prefetch(
+                    file_key
+                    for _, file_key, _ in pending[start + batch_size:start + 2 * batch_size]
+                )
+                changed.update(
+                    item[0] for item, is_changed in zip(batch, results) if is_changed
+                )
 
         return changed
 
-    def mark_files_processed(self, file_paths: Set[Path]):
+    def _prefetch(self, file_keys: Iterable[str]):
+        """
+        Pide al kernel leer por adelantado archivos que se van a hashear.
+
+        posix_fadvise(WILLNEED) encola la lectura y vuelve enseguida, así
+        que el disco atiende toda la tanda en paralelo y los hilos de
+        hashing encuentran los datos ya en el page cache.
+
+        Args:
+            file_keys: Rutas absolutas de los archivos
+        """
+        if not hasattr(os, "posix_fadvise"):
+            return
+
+        for file_key in file_keys:
+            try:
+                fd = os.open(file_key, os.O_RDONLY)
+            except OSError:
+                continue
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            except OSError:
+                pass
+            finally:
+                os.close(fd)
+
+    def mark_files_processed(self, file_paths: Iterable[Path]):
         """
         Marca archivos como procesados actualizando sus hashes.
 
         Args:
-            file_paths: Conjunto de archivos procesados
+            file_paths: Archivos procesados
         """
+        files_state = self.state["files"]
+        dirty_files = self._dirty_files
+        deleted_files = self._deleted_files
+        get_file_entry = self._get_file_entry
+        file_key_of = self._file_key
+
         for file_path in file_paths:
-            self.update_file(file_path)
+            file_key = file_key_of(file_path)
+            entry = get_file_entry(file_key, file_path)
+            if entry is None:
+                if files_state.pop(file_key, None) is not None:
+                    dirty_files.discard(file_key)
+                    deleted_files.add(file_key)
+            elif entry is not files_state.get(file_key):
+                # Entradas reutilizadas por (mtime, size) no se reescriben
+                files_state[file_key] = entry
+                deleted_files.discard(file_key)
+                dirty_files.add(file_key)
+
+            # Guardar el progreso cada tanto en escaneos largos
+            if len(dirty_files) + len(deleted_files) >= self.CHECKPOINT_INTERVAL:
+                self.checkpoint()
 
     def get_module_state(self, module_name: str) -> Dict:
         """
@@ -152,9 +490,22 @@ class StateManager:
             data: Datos del módulo
         """
         self.state["modules"][module_name] = data
+        self._dirty_modules.add(module_name)
 
     def clear_state(self):
         """Limpia todo el estado."""
-        self.state = {"last_update": None, "files": {}, "modules": {}}
-        if self.state_file.exists():
-            self.state_file.unlink()
+        self.state = self._empty_state()
+        self._hash_cache.clear()
+        self._dirty_files.clear()
+        self._deleted_files.clear()
+        self._dirty_modules.clear()
+        with self._conn as conn:
+            conn.execute("DELETE FROM files")
+            conn.execute("DELETE FROM modules")
+            conn.execute("DELETE FROM meta WHERE key = 'last_update'")
+
+    def close(self):
+        """Cierra la conexión con la base de estado."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
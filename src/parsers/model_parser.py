@@ -2,12 +2,20 @@
 Parser de modelos Python de Odoo usando análisis AST.
 """
 import ast
+import hashlib
+import os
+import pickle
+import shutil
+from sys import intern
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Optional, Set
-from dataclasses import dataclass, asdict, field
+from dataclasses import dataclass, field
+from config import Config
+from ..utils.filesystem import iter_source_files
 
 
-@dataclass
+@dataclass(slots=True)
 class OdooField:
     """Representa un campo de un modelo Odoo."""
 
@@ -16,8 +24,12 @@ class OdooField:
     related_model: Optional[str] = None
     attributes: Dict = field(default_factory=dict)
 
+    def to_dict(self) -> Dict:
+        """Convierte a diccionario."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
 
-@dataclass
+@dataclass(slots=True)
 class OdooModel:
     """Representa un modelo Odoo."""
 
@@ -34,9 +46,11 @@ class OdooModel:
     is_transient: bool = False
 
     def to_dict(self) -> Dict:
-        """Convierte a diccionario."""
-        data = asdict(self)
-        data["fields"] = [f.__dict__ for f in self.fields]
+        """Convierte a diccionario (incluye el model_type calculado)."""
+        # Sin asdict: evita la copia profunda recursiva de listas y campos
+        data = {name: getattr(self, name) for name in self.__slots__}
+        data["fields"] = [f.to_dict() for f in self.fields]
+        data["model_type"] = self.model_type
         return data
 
     @property
@@ -53,6 +67,42 @@ class OdooModel:
         return "base"
 
 
+# Nombres que se evalúan como constantes conocidas
+_NAME_CONSTANTS = {"True": True, "False": False, "None": None}
+
+
+def _eval_node(node):
+    """
+    Evalúa un nodo AST literal de forma segura.
+
+    Despacha por type(node) con un dict en lugar de una cadena de
+    isinstance: una sola búsqueda por nodo.
+
+    Args:
+        node: Nodo AST
+
+    Returns:
+        Valor evaluado o None si no es un literal soportado
+    """
+    handler = _EVAL_DISPATCH.get(type(node))
+    if handler is None:
+        return None
+    try:
+        return handler(node)
+    except Exception:
+        return None
+
+
+_EVAL_DISPATCH = {
+    ast.Constant: lambda node: node.value,
+    ast.List: lambda node: [_eval_node(n) for n in node.elts],
+    ast.Dict: lambda node: {
+        _eval_node(k): _eval_node(v) for k, v in zip(node.keys, node.values)
+    },
+    ast.Name: lambda node: _NAME_CONSTANTS.get(node.id),
+}
+
+
 class ModelParser:
     """Parser de modelos Odoo desde archivos Python."""
 
@@ -64,36 +114,121 @@ class ModelParser:
         "Reference",
     }
 
-    def __init__(self, module_name: str):
+    # Versión del formato del cache de parseo: subirla cuando cambie lo que
+    # produce el parser para invalidar los resultados guardados
+    PARSE_CACHE_VERSION = 3
+
+    def __init__(self, module_name: str, cache_dir: Optional[Path] = None):
         """
         Inicializa el parser.
 
         Args:
             module_name: Nombre del módulo Odoo
+            cache_dir: Directorio del cache de parseo (default: Config.PARSE_CACHE_DIR)
         """
-        self.module_name = module_name
+        # Cadenas repetidas en miles de instancias (módulo, tipos de campo,
+        # nombres de modelo): internadas se comparten y comparan por identidad
+        self.module_name = intern(module_name)
         self.models: List[OdooModel] = []
+        self.cache_dir = cache_dir or Config.PARSE_CACHE_DIR
 
     def parse_file(self, file_path: Path) -> List[OdooModel]:
         """
         Parsea un archivo Python buscando modelos Odoo.
 
+        Si el archivo no cambió (mismo mtime y tamaño) desde que se parseó,
+        devuelve los modelos guardados en el cache sin volver a parsearlo.
+        Los archivos descartados por el prefiltro no pasan por el cache.
+
+        Args:
+            file_path: Ruta al archivo .py
+
+        Returns:
+            Lista de modelos encontrados
+        """
+        try:
+            st = os.stat(file_path)
+            content = file_path.read_bytes()
+        except OSError as e:
+            print(f"Error parseando {file_path}: {e}")
+            return []
+
+        # Un modelo siempre hereda de models.<Clase>: si el texto no
+        # aparece no hay nada que buscar y se evita ast.parse
+        if b"models." not in content:
+            return []
+
+        file_key = f"{self.module_name}:{file_path.absolute()}"
+        cache_file = self.cache_dir / (
+            hashlib.blake2b(file_key.encode(), digest_size=16).hexdigest() + ".pkl"
+        )
+        signature = (self.PARSE_CACHE_VERSION, st.st_mtime_ns, st.st_size)
+
+        try:
+            with open(cache_file, "rb") as f:
+                cached_signature, cached_models = pickle.load(f)
+            if cached_signature == signature:
+                return cached_models
+        except Exception:
+            # Sin cache o cache ilegible: parsear normalmente
+            pass
+
+        models = self._parse_content(content, file_path)
+        self._store_cache(cache_file, signature, models)
+        return models
+
+    def _store_cache(self, cache_file: Path, signature: tuple, models: List[OdooModel]):
+        """
+        Guarda los modelos de un archivo en el cache de parseo.
+
+        Escribe a un archivo temporal y lo renombra, para que otro proceso
+        nunca lea un pickle a medio escribir.
+
+        Args:
+            cache_file: Archivo de cache
+            signature: (versión, mtime_ns, size) del archivo parseado
+            models: Modelos encontrados
+        """
+        tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(tmp_file, "wb") as f:
+                pickle.dump((signature, models), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, cache_file)
+        except Exception as e:
+            print(f"Error guardando cache de parseo {cache_file}: {e}")
+            tmp_file.unlink(missing_ok=True)
+
+    @classmethod
+    def clear_cache(cls, cache_dir: Optional[Path] = None):
+        """
+        Borra el cache de parseo, incluidas las entradas de archivos que ya
+        no existen.
+
+        Args:
+            cache_dir: Directorio del cache de parseo (default: Config.PARSE_CACHE_DIR)
+        """
+        shutil.rmtree(cache_dir or Config.PARSE_CACHE_DIR, ignore_errors=True)
+
+    def _parse_content(self, content: bytes, file_path: Path) -> List[OdooModel]:
+        """
+        Parsea el contenido de un archivo Python sin pasar por el cache.
+
         Args:
+            content: Contenido del archivo
             file_path: Ruta al archivo .py
 
         Returns:
             Lista de modelos encontrados
         """
         try:
-            content = file_path.read_text(encoding="utf-8")
             tree = ast.parse(content, filename=str(file_path))
 
             models = []
-            for node in ast.walk(tree):
-                if isinstance(node, ast.ClassDef):
-                    model = self._parse_class(node, file_path)
-                    if model:
-                        models.append(model)
+            for node in self._iter_class_defs(tree.body):
+                model = self._parse_class(node, file_path)
+                if model:
+                    models.append(model)
 
             return models
 
@@ -101,25 +236,58 @@ class ModelParser:
             print(f"Error parseando {file_path}: {e}")
             return []
 
-    def parse_directory(self, directory: Path) -> List[OdooModel]:
+    def _iter_class_defs(self, body: List[ast.stmt]):
+        """
+        Recorre las clases de nivel módulo sin visitar todo el árbol.
+
+        Los modelos Odoo se definen a nivel módulo; solo se desciende en
+        bloques if/try (imports condicionales, compatibilidad de versiones),
+        nunca en funciones ni expresiones.
+
+        Args:
+            body: Sentencias a recorrer
+
+        Yields:
+            Nodos ast.ClassDef
+        """
+        for node in body:
+            if isinstance(node, ast.ClassDef):
+                yield node
+            elif isinstance(node, ast.If):
+                yield from self._iter_class_defs(node.body)
+                yield from self._iter_class_defs(node.orelse)
+            elif isinstance(node, ast.Try):
+                yield from self._iter_class_defs(node.body)
+                for handler in node.handlers:
+                    yield from self._iter_class_defs(handler.body)
+                yield from self._iter_class_defs(node.orelse)
+                yield from self._iter_class_defs(node.finalbody)
+
+    def parse_directory(self, directory: Path, max_workers: int = 1) -> List[OdooModel]:
         """
         Parsea todos los archivos Python en un directorio.
 
         Args:
             directory: Directorio a escanear
+            max_workers: Procesos para parsear en paralelo (1 = secuencial;
+                el CLI ya paraleliza por módulo)
 
         Returns:
             Lista de todos los modelos encontrados
         """
-        all_models = []
+        # Excluye __pycache__ y archivos de test
+        py_files = [Path(p) for p in iter_source_files(directory, ".py")]
 
-        for py_file in directory.rglob("*.py"):
-            # Excluir archivos de test
-            if "test_" in py_file.name or "__pycache__" in str(py_file):
-                continue
+        all_models = []
 
-            models = self.parse_file(py_file)
-            all_models.extend(models)
+        if max_workers > 1 and len(py_files) > 1:
+            # ast.parse retiene el GIL: paralelizar con procesos
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                for models in executor.map(self.parse_file, py_files, chunksize=8):
+                    all_models.extend(models)
+        else:
+            for py_file in py_files:
+                all_models.extend(self.parse_file(py_file))
 
         return all_models
 
@@ -138,23 +306,41 @@ class ModelParser:
         if not self._is_odoo_model(node):
             return None
 
+        # Una sola pasada por el cuerpo de la clase: primera asignación de
+        # cada nombre (atributos del modelo) y campos en orden de definición
+        assigns = {}
+        fields = []
+        for item in node.body:
+            if isinstance(item, ast.Assign):
+                value = item.value
+                is_call = isinstance(value, ast.Call)
+                for target in item.targets:
+                    if isinstance(target, ast.Name):
+                        assigns.setdefault(target.id, value)
+                        if is_call:
+                            field = self._parse_field_definition(target.id, value)
+                            if field:
+                                fields.append(field)
+
+        def get_attribute(attr_name):
+            value_node = assigns.get(attr_name)
+            return None if value_node is None else self._eval_node(value_node)
+
         # Extraer atributos del modelo
-        name = self._get_attribute(node, "_name")
-        inherits = self._get_attribute(node, "_inherit") or []
-        inherits_models = self._get_attribute(node, "_inherits") or {}
-        description = self._get_attribute(node, "_description") or ""
-        transient_model = self._get_attribute(node, "_transient") or False
+        name = get_attribute("_name")
+        inherits = get_attribute("_inherit") or []
+        inherits_models = get_attribute("_inherits") or {}
+        description = get_attribute("_description") or ""
+        transient_model = get_attribute("_transient") or False
 
         # Normalizar _inherit (puede ser string o lista)
         if isinstance(inherits, str):
             inherits = [inherits]
+        inherits = [intern(i) if type(i) is str else i for i in inherits]
 
         # Detectar si es TransientModel por herencia de clase
         is_transient = transient_model or self._inherits_transient(node)
 
-        # Parsear campos
-        fields = self._parse_fields(node)
-
         # Determinar si es extensión (solo _inherit, sin _name)
         is_extension = bool(inherits) and not name
 
@@ -162,7 +348,7 @@ class ModelParser:
         if is_extension and len(inherits) == 1:
             effective_name = inherits[0]
         else:
-            effective_name = name
+            effective_name = intern(name) if type(name) is str else name
 
         return OdooModel(
             name=effective_name,
@@ -212,24 +398,6 @@ class ModelParser:
                     return True
         return False
 
-    def _get_attribute(self, node: ast.ClassDef, attr_name: str):
-        """
-        Obtiene el valor de un atributo de clase.
-
-        Args:
-            node: Nodo de clase
-            attr_name: Nombre del atributo
-
-        Returns:
-            Valor del atributo o None
-        """
-        for item in node.body:
-            if isinstance(item, ast.Assign):
-                for target in item.targets:
-                    if isinstance(target, ast.Name) and target.id == attr_name:
-                        return self._eval_node(item.value)
-        return None
-
     def _eval_node(self, node):
         """
         Evalúa un nodo AST de forma segura.
@@ -240,51 +408,7 @@ class ModelParser:
         Returns:
             Valor evaluado
         """
-        try:
-            if isinstance(node, ast.Constant):
-                return node.value
-            elif isinstance(node, ast.Str):  # Python < 3.8
-                return node.s
-            elif isinstance(node, ast.List):
-                return [self._eval_node(n) for n in node.elts]
-            elif isinstance(node, ast.Dict):
-                return {
-                    self._eval_node(k): self._eval_node(v)
-                    for k, v in zip(node.keys, node.values)
-                }
-            elif isinstance(node, ast.Name):
-                # Constantes conocidas
-                if node.id == "True":
-                    return True
-                elif node.id == "False":
-                    return False
-                elif node.id == "None":
-                    return None
-        except:
-            pass
-        return None
-
-    def _parse_fields(self, node: ast.ClassDef) -> List[OdooField]:
-        """
-        Extrae los campos definidos en el modelo.
-
-        Args:
-            node: Nodo de clase
-
-        Returns:
-            Lista de campos
-        """
-        fields = []
-
-        for item in node.body:
-            if isinstance(item, ast.Assign):
-                for target in item.targets:
-                    if isinstance(target, ast.Name):
-                        field = self._parse_field_definition(target.id, item.value)
-                        if field:
-                            fields.append(field)
-
-        return fields
+        return _eval_node(node)
 
     def _parse_field_definition(
         self, field_name: str, value_node
@@ -311,6 +435,8 @@ class ModelParser:
         related_model = None
         if field_type in self.RELATIONAL_FIELDS:
             related_model = self._get_related_model(value_node)
+            if type(related_model) is str:
+                related_model = intern(related_model)
 
         # Extraer atributos adicionales
         attributes = self._extract_field_attributes(value_node)
@@ -329,7 +455,7 @@ class ModelParser:
                 isinstance(call_node.func.value, ast.Name)
                 and call_node.func.value.id == "fields"
             ):
-                return call_node.func.attr
+                return intern(call_node.func.attr)
         return None
 
     def _get_related_model(self, call_node: ast.Call) -> Optional[str]:
@@ -355,6 +481,6 @@ class ModelParser:
             if keyword.arg:
                 value = self._eval_node(keyword.value)
                 if value is not None:
-                    attributes[keyword.arg] = value
+                    attributes[intern(keyword.arg)] = value
 
         return attributes
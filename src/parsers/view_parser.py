@@ -1,13 +1,16 @@
 """
 Parser de vistas XML de Odoo.
 """
+from sys import intern
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from lxml import etree
+from ..utils.filesystem import iter_source_files
 
 
-@dataclass
+@dataclass(slots=True)
 class OdooView:
     """Representa una vista de Odoo."""
 
@@ -23,7 +26,7 @@ class OdooView:
 
     def to_dict(self) -> Dict:
         """Convierte a diccionario."""
-        return asdict(self)
+        return {name: getattr(self, name) for name in self.__slots__}
 
     @property
     def is_extension(self) -> bool:
@@ -34,6 +37,9 @@ class OdooView:
 class ViewParser:
     """Parser de vistas XML de Odoo."""
 
+    # Subdirectorios del módulo donde se buscan vistas (además de la raíz)
+    VIEW_DIRS = {"views", "data", "security"}
+
     def __init__(self, module_name: str):
         """
         Inicializa el parser.
@@ -41,7 +47,9 @@ class ViewParser:
         Args:
             module_name: Nombre del módulo Odoo
         """
-        self.module_name = module_name
+        # Módulo, modelo y tipo de vista se repiten en todas las vistas:
+        # internados se comparten en lugar de duplicarse por instancia
+        self.module_name = intern(module_name)
         self.views: List[OdooView] = []
 
     def parse_file(self, file_path: Path) -> List[OdooView]:
@@ -55,16 +63,25 @@ class ViewParser:
             Lista de vistas encontradas
         """
         try:
-            tree = etree.parse(str(file_path))
-            root = tree.getroot()
-
             views = []
 
-            # Buscar todos los <record> con model="ir.ui.view"
-            for record in root.xpath("//record[@model='ir.ui.view']"):
-                view = self._parse_view_record(record, file_path)
-                if view:
-                    views.append(view)
+            # Streaming: solo eventos de cierre de <record>, liberando cada
+            # record (y sus hermanos anteriores) apenas se procesa, así la
+            # memoria no crece con el tamaño del archivo
+            for _, record in etree.iterparse(
+                str(file_path), events=("end",), tag="record"
+            ):
+                # Solo los <record> con model="ir.ui.view"
+                if record.get("model") == "ir.ui.view":
+                    view = self._parse_view_record(record, file_path)
+                    if view:
+                        views.append(view)
+
+                record.clear()
+                parent = record.getparent()
+                if parent is not None:
+                    while record.getprevious() is not None:
+                        del parent[0]
 
             return views
 
@@ -72,32 +89,34 @@ class ViewParser:
             print(f"Error parseando XML {file_path}: {e}")
             return []
 
-    def parse_directory(self, directory: Path) -> List[OdooView]:
+    def parse_directory(self, directory: Path, max_workers: int = 1) -> List[OdooView]:
         """
         Parsea todos los archivos XML en un directorio.
 
         Args:
             directory: Directorio a escanear
+            max_workers: Hilos para parsear en paralelo (1 = secuencial)
 
         Returns:
             Lista de todas las vistas encontradas
         """
-        all_views = []
+        # Un solo recorrido: XML de la raíz y de los subdirectorios comunes
+        # de vistas (en cualquier profundidad dentro de ellos)
+        xml_files = [
+            Path(p)
+            for p in iter_source_files(directory, ".xml", top_dirs=self.VIEW_DIRS)
+        ]
 
-        # Buscar en subdirectorios comunes de vistas
-        search_patterns = ["views/**/*.xml", "data/**/*.xml", "security/**/*.xml"]
+        all_views = []
 
-        for pattern in search_patterns:
-            for xml_file in directory.glob(pattern):
-                if xml_file.is_file():
-                    views = self.parse_file(xml_file)
+        if max_workers > 1 and len(xml_files) > 1:
+            # lxml suelta el GIL al parsear: alcanza con hilos
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for views in executor.map(self.parse_file, xml_files):
                     all_views.extend(views)
-
-        # También buscar en raíz
-        for xml_file in directory.glob("*.xml"):
-            if xml_file.is_file():
-                views = self.parse_file(xml_file)
-                all_views.extend(views)
+        else:
+            for xml_file in xml_files:
+                all_views.extend(self.parse_file(xml_file))
 
         return all_views
 
@@ -123,17 +142,26 @@ class ViewParser:
             # Construir ID completo (module.xml_id)
             full_xml_id = f"{self.module_name}.{xml_id}"
 
+            # Una sola pasada por los <field> hijos del record; los <field>
+            # dentro del arch no son campos del record
+            fields = {}
+            for child in record:
+                if child.tag == "field":
+                    fields.setdefault(child.get("name"), child)
+
             # Extraer campos
-            name = self._get_field_value(record, "name") or xml_id
-            model = self._get_field_value(record, "model")
-            view_type = self._get_field_value(record, "type") or "form"
-            inherit_id = self._get_field_ref(record, "inherit_id")
-            priority = self._get_field_value(record, "priority") or "16"
-            arch = self._get_field_arch(record)
+            name = self._get_field_value(fields, "name") or xml_id
+            model = self._get_field_value(fields, "model")
+            view_type = self._get_field_value(fields, "type") or "form"
+            inherit_id = self._get_field_ref(fields, "inherit_id")
+            priority = self._get_field_value(fields, "priority") or "16"
+            arch = self._get_field_arch(fields)
 
             # Validar campos requeridos
             if not model:
                 return None
+            model = intern(model)
+            view_type = intern(view_type)
 
             return OdooView(
                 xml_id=full_xml_id,
@@ -151,49 +179,53 @@ class ViewParser:
             print(f"Error parseando record de vista: {e}")
             return None
 
-    def _get_field_value(self, record: etree.Element, field_name: str) -> Optional[str]:
+    def _get_field_value(
+        self, fields: Dict[str, etree.Element], field_name: str
+    ) -> Optional[str]:
         """
         Obtiene el valor de un campo <field name="...">valor</field>.
 
         Args:
-            record: Elemento record
+            fields: Campos del record por nombre
             field_name: Nombre del campo
 
         Returns:
             Valor del campo o None
         """
-        field = record.find(f".//field[@name='{field_name}']")
+        field = fields.get(field_name)
         if field is not None:
             return field.text
         return None
 
-    def _get_field_ref(self, record: etree.Element, field_name: str) -> Optional[str]:
+    def _get_field_ref(
+        self, fields: Dict[str, etree.Element], field_name: str
+    ) -> Optional[str]:
         """
         Obtiene la referencia de un campo <field name="..." ref="..."/>.
 
         Args:
-            record: Elemento record
+            fields: Campos del record por nombre
             field_name: Nombre del campo
 
         Returns:
             Valor del atributo ref o None
         """
-        field = record.find(f".//field[@name='{field_name}']")
+        field = fields.get(field_name)
         if field is not None:
             return field.get("ref")
         return None
 
-    def _get_field_arch(self, record: etree.Element) -> str:
+    def _get_field_arch(self, fields: Dict[str, etree.Element]) -> str:
         """
         Obtiene el contenido del campo arch (estructura de la vista).
 
         Args:
-            record: Elemento record
+            fields: Campos del record por nombre
 
         Returns:
             Contenido XML del arch como string
         """
-        arch_field = record.find(".//field[@name='arch']")
+        arch_field = fields.get("arch")
         if arch_field is not None:
             # Serializar el contenido interno
             content = []
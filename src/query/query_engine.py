@@ -1,16 +1,154 @@
 """
 Motor de consultas predefinidas y ad-hoc sobre el grafo.
 """
-from typing import List, Dict, Optional
-from neo4j import GraphDatabase
+import logging
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Iterator, List, Dict, Optional
+from neo4j import GraphDatabase, Session
 from config import Config
 from src.graph.schema import GraphSchema
+from src.utils.logger import get_logger
+
+# Queries construidas una sola vez al importar: el texto idéntico entre
+# llamadas permite a Neo4j reutilizar el plan cacheado
+_S = GraphSchema
+
+# Registros pedidos al servidor por cada viaje al leer un resultado
+_FETCH_SIZE = 1000
+
+_Q_MODEL_CHILDREN = f"""
+    MATCH (child:{_S.NODE_MODEL})-[:{_S.REL_MODEL_INHERITS}]->(parent:{_S.NODE_MODEL} {{name: $model_name}})
+    RETURN child.name as name, child.module as module, child.model_type as model_type
+    ORDER BY child.name
+"""
+
+_Q_MODEL_PARENTS = f"""
+    MATCH (child:{_S.NODE_MODEL} {{name: $model_name}})-[:{_S.REL_MODEL_INHERITS}]->(parent:{_S.NODE_MODEL})
+    RETURN parent.name as name, parent.module as module, parent.model_type as model_type
+    ORDER BY parent.name
+"""
+
+_Q_VIEWS_FOR_MODEL = f"""
+    MATCH (v:{_S.NODE_VIEW})-[:{_S.REL_VIEW_FOR_MODEL}]->(m:{_S.NODE_MODEL} {{name: $model_name}})
+    RETURN v.xml_id as xml_id, v.name as name, v.view_type as view_type, v.module as module
+    ORDER BY v.view_type, v.priority
+"""
+
+_Q_VIEW_EXTENSIONS = f"""
+    MATCH (child:{_S.NODE_VIEW})-[:{_S.REL_VIEW_EXTENDS}]->(parent:{_S.NODE_VIEW} {{xml_id: $view_xml_id}})
+    RETURN child.xml_id as xml_id, child.name as name, child.module as module
+    ORDER BY child.xml_id
+"""
+
+_Q_MODEL_FIELDS_BY_TYPE = f"""
+    MATCH (m:{_S.NODE_MODEL} {{name: $model_name}})-[:{_S.REL_MODEL_HAS_FIELD}]->(f:{_S.NODE_FIELD} {{field_type: $field_type}})
+    RETURN f.name as name, f.field_type as field_type
+    ORDER BY f.name
+"""
+
+_Q_MODEL_FIELDS = f"""
+    MATCH (m:{_S.NODE_MODEL} {{name: $model_name}})-[:{_S.REL_MODEL_HAS_FIELD}]->(f:{_S.NODE_FIELD})
+    RETURN f.name as name, f.field_type as field_type
+    ORDER BY f.name
+"""
+
+_Q_MODEL_RELATIONS = f"""
+    MATCH (m:{_S.NODE_MODEL} {{name: $model_name}})-[:{_S.REL_MODEL_HAS_FIELD}]->(f:{_S.NODE_FIELD})
+    MATCH (f)-[:{_S.REL_FIELD_RELATES_TO}]->(target:{_S.NODE_MODEL})
+    RETURN f.name as field_name, f.field_type as field_type, target.name as target_model
+    ORDER BY f.name
+"""
+
+_Q_MODULE_DEPENDENCIES = f"""
+    MATCH (m:{_S.NODE_MODULE} {{name: $module_name}})-[:{_S.REL_MODULE_DEPENDS}]->(dep:{_S.NODE_MODULE})
+    RETURN dep.name as name, dep.version as version
+    ORDER BY dep.name
+"""
+
+_Q_MODULE_DEPENDENTS = f"""
+    MATCH (dependent:{_S.NODE_MODULE})-[:{_S.REL_MODULE_DEPENDS}]->(m:{_S.NODE_MODULE} {{name: $module_name}})
+    RETURN dependent.name as name, dependent.version as version
+    ORDER BY dependent.name
+"""
+
+_Q_SEARCH_MODELS = f"""
+    MATCH (m:{_S.NODE_MODEL})
+    WHERE m.name CONTAINS $search_term
+    RETURN m.name as name, m.module as module, m.description as description
+    ORDER BY m.name
+    LIMIT 50
+"""
+
+# Cada conteo es un subquery COUNT {} independiente: tres OPTIONAL MATCH
+# seguidos multiplicaban sus filas antes del count(DISTINCT ...)
+_Q_MODEL_IMPACT = f"""
+    MATCH (m:{_S.NODE_MODEL} {{name: $model_name}})
+    RETURN m.name as model,
+           COUNT {{ (:{_S.NODE_MODEL})-[:{_S.REL_MODEL_INHERITS}]->(m) }} as children_count,
+           COUNT {{ (:{_S.NODE_VIEW})-[:{_S.REL_VIEW_FOR_MODEL}]->(m) }} as views_count,
+           COUNT {{
+               MATCH (m)-[:{_S.REL_MODEL_HAS_FIELD}]->(:{_S.NODE_FIELD})-[:{_S.REL_FIELD_RELATES_TO}]->(related:{_S.NODE_MODEL})
+               RETURN DISTINCT related
+           }} as related_models_count
+"""
+
+
+@lru_cache(maxsize=None)
+def _model_hierarchy_query(depth: int) -> str:
+    """
+    Construye (una vez por profundidad) la query de jerarquía de herencia.
+
+    La profundidad va en el quantified path pattern (Neo4j 5.9+), que Cypher
+    no acepta como parámetro. La etiqueta de modelo se exige en cada salto
+    para podar durante la expansión.
+
+    Args:
+        depth: Profundidad máxima de búsqueda
+
+    Returns:
+        Query Cypher
+    """
+    return f"""
+    MATCH path = (child:{_S.NODE_MODEL} {{name: $model_name}})((:{_S.NODE_MODEL})-[:{_S.REL_MODEL_INHERITS}]->(:{_S.NODE_MODEL})){{1,{depth}}}(parent:{_S.NODE_MODEL})
+    WITH child, parent, path
+    RETURN child.name as child, parent.name as parent, length(path) as depth
+    ORDER BY depth, parent
+    LIMIT $max_rows
+    """
+
+
+def _require_pandas():
+    """
+    Verifica que pandas (dependencia opcional) esté instalado.
+
+    Raises:
+        ImportError: Si pandas no está instalado
+    """
+    try:
+        import pandas  # noqa: F401
+    except ImportError:
+        raise ImportError(
+            "Los métodos *_df requieren pandas, que es una dependencia "
+            "opcional: instálalo con `pip install pandas`"
+        ) from None
 
 
 class QueryEngine:
     """Motor de consultas sobre el grafo de dependencias Odoo."""
 
-    def __init__(self, uri: str = None, user: str = None, password: str = None):
+    def __init__(
+        self,
+        uri: str = None,
+        user: str = None,
+        password: str = None,
+        max_depth: int = 6,
+        max_rows: int = 10_000,
+        cache_size: int = 1024,
+        cache_ttl: float = 300,
+    ):
         """
         Inicializa el motor de consultas.
 
@@ -18,16 +156,143 @@ class QueryEngine:
             uri: URI de Neo4j
             user: Usuario
             password: Contraseña
+            max_depth: Profundidad máxima permitida en recorridos de
+                longitud variable (las profundidades mayores se recortan y
+                las menores que 1 se llevan a 1)
+            max_rows: Máximo de filas devueltas por los recorridos
+            cache_size: Máximo de resultados en la caché de consultas
+            cache_ttl: Segundos que un resultado cacheado sigue siendo válido
         """
         self.uri = uri or Config.NEO4J_URI
         self.user = user or Config.NEO4J_USER
         self.password = password or Config.NEO4J_PASSWORD
-
-        self.driver = GraphDatabase.driver(self.uri, auth=(self.user, self.password))
+        self.max_depth = max_depth
+        self.max_rows = max_rows
+
+        self.driver = GraphDatabase.driver(
+            self.uri,
+            auth=(self.user, self.password),
+            max_connection_pool_size=Config.NEO4J_MAX_POOL_SIZE,
+        )
         self.schema = GraphSchema()
+        self.logger = get_logger(__name__)
+
+        # Una sesión por hilo, reutilizada entre consultas: las sesiones no
+        # son thread-safe y abrir una por consulta cuesta adquirir conexión
+        self._local = threading.local()
+        self._sessions: List[Session] = []
+        self._sessions_lock = threading.Lock()
+
+        # Caché LRU con TTL de resultados: (método, args) -> (instante, valor).
+        # Los clientes interactivos repiten las mismas consultas al navegar
+        self._cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._cache_size = cache_size
+        self._cache_ttl = cache_ttl
+        self._cache_lock = threading.Lock()
+
+    def _cached(self, key: tuple, fn: Callable[[], Any]) -> Any:
+        """
+        Devuelve el resultado cacheado de una consulta o la ejecuta.
+
+        Args:
+            key: Clave (nombre de la consulta, argumentos...)
+            fn: Función que ejecuta la consulta si no hay resultado válido
+
+        Returns:
+            Resultado de la consulta
+        """
+        now = time.monotonic()
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is not None and now - entry[0] < self._cache_ttl:
+                self._cache.move_to_end(key)
+                return entry[1]
+
+        value = fn()
+
+        with self._cache_lock:
+            self._cache[key] = (now, value)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return value
+
+    def invalidate_cache(self):
+        """Vacía la caché de resultados (p. ej. tras cargar datos nuevos)."""
+        with self._cache_lock:
+            self._cache.clear()
+
+    def _get_session(self) -> Session:
+        """
+        Obtiene la sesión del hilo actual, creándola la primera vez.
+
+        Returns:
+            Sesión de Neo4j del hilo
+        """
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = self.driver.session(
+                fetch_size=_FETCH_SIZE
+            )
+            with self._sessions_lock:
+                self._sessions.append(session)
+        return session
+
+    def _log_profile(self, query: str, **params):
+        """
+        Ejecuta la query con PROFILE y registra en DEBUG los db hits y filas.
+
+        Sirve para detectar regresiones de plan en los recorridos profundos.
+
+        Args:
+            query: Query Cypher
+            **params: Parámetros de la query
+        """
+        session = self._get_session()
+        profile = session.run(f"PROFILE {query}", **params).consume().profile
+        if not profile:
+            return
+
+        db_hits = 0
+        pending = [profile]
+        while pending:
+            operator = pending.pop()
+            db_hits += operator.get("dbHits", 0)
+            pending.extend(operator.get("children", ()))
+
+        self.logger.debug(
+            f"PROFILE {profile.get('operatorType')}: {db_hits} db hits, "
+            f"{profile.get('rows', 0)} filas, params={params}"
+        )
+
+    def _iter_records(self, query: str, **params) -> Iterator[Dict]:
+        """
+        Ejecuta una query y devuelve sus registros de forma perezosa.
+
+        El driver trae los registros por lotes mientras se itera, así que
+        el resultado completo nunca está en memoria. Si se lanza otra query
+        en el mismo hilo antes de agotar el iterador, el driver almacena en
+        buffer lo que quede pendiente.
+
+        Args:
+            query: Query Cypher
+            **params: Parámetros de la query
+
+        Yields:
+            Cada registro como diccionario
+        """
+        session = self._get_session()
+        for record in session.run(query, **params):
+            yield record.data()
 
     def close(self):
-        """Cierra la conexión."""
+        """Cierra las sesiones abiertas y la conexión."""
+        with self._sessions_lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            session.close()
+        self._local = threading.local()
+
         if self.driver:
             self.driver.close()
 
@@ -49,15 +314,22 @@ class QueryEngine:
         Returns:
             Lista de modelos hijos
         """
-        query = f"""
-        MATCH (child:{self.schema.NODE_MODEL})-[:{self.schema.REL_MODEL_INHERITS}]->(parent:{self.schema.NODE_MODEL} {{name: $model_name}})
-        RETURN child.name as name, child.module as module, child.model_type as model_type
-        ORDER BY child.name
+        return self._cached(
+            ("children", model_name),
+            lambda: list(self.iter_model_children(model_name)),
+        )
+
+    def iter_model_children(self, model_name: str) -> Iterator[Dict]:
         """
+        Versión en streaming de get_model_children (sin caché).
 
-        with self.driver.session() as session:
-            result = session.run(query, model_name=model_name)
-            return [dict(record) for record in result]
+        Args:
+            model_name: Nombre del modelo padre
+
+        Yields:
+            Modelos hijos, uno a uno
+        """
+        return self._iter_records(_Q_MODEL_CHILDREN, model_name=model_name)
 
     def get_model_parents(self, model_name: str) -> List[Dict]:
         """
@@ -69,20 +341,32 @@ class QueryEngine:
         Returns:
             Lista de modelos padre
         """
-        query = f"""
-        MATCH (child:{self.schema.NODE_MODEL} {{name: $model_name}})-[:{self.schema.REL_MODEL_INHERITS}]->(parent:{self.schema.NODE_MODEL})
-        RETURN parent.name as name, parent.module as module, parent.model_type as model_type
-        ORDER BY parent.name
+        return self._cached(
+            ("parents", model_name),
+            lambda: list(self.iter_model_parents(model_name)),
+        )
+
+    def iter_model_parents(self, model_name: str) -> Iterator[Dict]:
         """
+        Versión en streaming de get_model_parents (sin caché).
 
-        with self.driver.session() as session:
-            result = session.run(query, model_name=model_name)
-            return [dict(record) for record in result]
+        Args:
+            model_name: Nombre del modelo hijo
+
+        Yields:
+            Modelos padre, uno a uno
+        """
+        return self._iter_records(_Q_MODEL_PARENTS, model_name=model_name)
 
     def get_model_hierarchy(self, model_name: str, depth: int = 5) -> Dict:
         """
         Obtiene la jerarquía completa de herencia de un modelo.
 
+        La profundidad se recorta a max_depth y el resultado a max_rows: el
+        coste de un patrón de longitud variable crece de forma explosiva con
+        la profundidad (se han medido saltos de ~70x en db-hits al pasar de
+        profundidad 9 a 10).
+
         Args:
             model_name: Nombre del modelo
             depth: Profundidad máxima de búsqueda
@@ -90,16 +374,18 @@ class QueryEngine:
         Returns:
             Diccionario con jerarquía completa
         """
-        query = f"""
-        MATCH path = (child:{self.schema.NODE_MODEL} {{name: $model_name}})-[:{self.schema.REL_MODEL_INHERITS}*..{depth}]->(parent:{self.schema.NODE_MODEL})
-        WITH child, parent, path
-        RETURN child.name as child, parent.name as parent, length(path) as depth
-        ORDER BY depth, parent
-        """
+        depth = max(1, min(depth, self.max_depth))
+        query = _model_hierarchy_query(depth)
 
-        with self.driver.session() as session:
-            result = session.run(query, model_name=model_name)
-            return {"model": model_name, "parents": [dict(record) for record in result]}
+        def fetch():
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self._log_profile(query, model_name=model_name, max_rows=self.max_rows)
+
+            session = self._get_session()
+            result = session.run(query, model_name=model_name, max_rows=self.max_rows)
+            return {"model": model_name, "parents": result.data()}
+
+        return self._cached(("hierarchy", model_name, depth), fetch)
 
     def get_views_for_model(self, model_name: str) -> List[Dict]:
         """
@@ -111,15 +397,22 @@ class QueryEngine:
         Returns:
             Lista de vistas
         """
-        query = f"""
-        MATCH (v:{self.schema.NODE_VIEW})-[:{self.schema.REL_VIEW_FOR_MODEL}]->(m:{self.schema.NODE_MODEL} {{name: $model_name}})
-        RETURN v.xml_id as xml_id, v.name as name, v.view_type as view_type, v.module as module
-        ORDER BY v.view_type, v.priority
+        return self._cached(
+            ("views", model_name),
+            lambda: list(self.iter_views_for_model(model_name)),
+        )
+
+    def iter_views_for_model(self, model_name: str) -> Iterator[Dict]:
         """
+        Versión en streaming de get_views_for_model (sin caché).
 
-        with self.driver.session() as session:
-            result = session.run(query, model_name=model_name)
-            return [dict(record) for record in result]
+        Args:
+            model_name: Nombre del modelo
+
+        Yields:
+            Vistas, uno a uno
+        """
+        return self._iter_records(_Q_VIEWS_FOR_MODEL, model_name=model_name)
 
     def get_view_extensions(self, view_xml_id: str) -> List[Dict]:
         """
@@ -131,15 +424,22 @@ class QueryEngine:
         Returns:
             Lista de vistas que la extienden
         """
-        query = f"""
-        MATCH (child:{self.schema.NODE_VIEW})-[:{self.schema.REL_VIEW_EXTENDS}]->(parent:{self.schema.NODE_VIEW} {{xml_id: $view_xml_id}})
-        RETURN child.xml_id as xml_id, child.name as name, child.module as module
-        ORDER BY child.xml_id
+        return self._cached(
+            ("view_extensions", view_xml_id),
+            lambda: list(self.iter_view_extensions(view_xml_id)),
+        )
+
+    def iter_view_extensions(self, view_xml_id: str) -> Iterator[Dict]:
         """
+        Versión en streaming de get_view_extensions (sin caché).
 
-        with self.driver.session() as session:
-            result = session.run(query, view_xml_id=view_xml_id)
-            return [dict(record) for record in result]
+        Args:
+            view_xml_id: XML ID de la vista padre
+
+        Yields:
+            Vistas que la extienden, uno a uno
+        """
+        return self._iter_records(_Q_VIEW_EXTENSIONS, view_xml_id=view_xml_id)
 
     def get_model_fields(self, model_name: str, field_type: str = None) -> List[Dict]:
         """
@@ -152,24 +452,58 @@ class QueryEngine:
         Returns:
             Lista de campos
         """
+        return self._cached(
+            ("fields", model_name, field_type),
+            lambda: list(self.iter_model_fields(model_name, field_type)),
+        )
+
+    def iter_model_fields(self, model_name: str, field_type: str = None) -> Iterator[Dict]:
+        """
+        Versión en streaming de get_model_fields (sin caché).
+
+        Args:
+            model_name: Nombre del modelo
+            field_type: Tipo de campo (opcional, para filtrar)
+
+        Yields:
+            Campos, uno a uno
+        """
+        if field_type:
+            query = _Q_MODEL_FIELDS_BY_TYPE
+            params = {"model_name": model_name, "field_type": field_type}
+        else:
+            query = _Q_MODEL_FIELDS
+            params = {"model_name": model_name}
+
+        return self._iter_records(query, **params)
+
+    def get_model_fields_df(self, model_name: str, field_type: str = None) -> "pandas.DataFrame":
+        """
+        Obtiene los campos de un modelo como DataFrame (requiere pandas).
+
+        El driver construye el DataFrame directamente desde el resultado,
+        sin crear un diccionario por registro.
+
+        Args:
+            model_name: Nombre del modelo
+            field_type: Tipo de campo (opcional, para filtrar)
+
+        Returns:
+            DataFrame con columnas name y field_type
+
+        Raises:
+            ImportError: Si pandas no está instalado
+        """
+        _require_pandas()
         if field_type:
-            query = f"""
-            MATCH (m:{self.schema.NODE_MODEL} {{name: $model_name}})-[:{self.schema.REL_MODEL_HAS_FIELD}]->(f:{self.schema.NODE_FIELD} {{field_type: $field_type}})
-            RETURN f.name as name, f.field_type as field_type
-            ORDER BY f.name
-            """
+            query = _Q_MODEL_FIELDS_BY_TYPE
             params = {"model_name": model_name, "field_type": field_type}
         else:
-            query = f"""
-            MATCH (m:{self.schema.NODE_MODEL} {{name: $model_name}})-[:{self.schema.REL_MODEL_HAS_FIELD}]->(f:{self.schema.NODE_FIELD})
-            RETURN f.name as name, f.field_type as field_type
-            ORDER BY f.name
-            """
+            query = _Q_MODEL_FIELDS
             params = {"model_name": model_name}
 
-        with self.driver.session() as session:
-            result = session.run(query, **params)
-            return [dict(record) for record in result]
+        session = self._get_session()
+        return session.run(query, **params).to_df()
 
     def get_model_relations(self, model_name: str) -> List[Dict]:
         """
@@ -181,16 +515,22 @@ class QueryEngine:
         Returns:
             Lista de modelos relacionados
         """
-        query = f"""
-        MATCH (m:{self.schema.NODE_MODEL} {{name: $model_name}})-[:{self.schema.REL_MODEL_HAS_FIELD}]->(f:{self.schema.NODE_FIELD})
-        MATCH (f)-[:{self.schema.REL_FIELD_RELATES_TO}]->(target:{self.schema.NODE_MODEL})
-        RETURN f.name as field_name, f.field_type as field_type, target.name as target_model
-        ORDER BY f.name
+        return self._cached(
+            ("relations", model_name),
+            lambda: list(self.iter_model_relations(model_name)),
+        )
+
+    def iter_model_relations(self, model_name: str) -> Iterator[Dict]:
         """
+        Versión en streaming de get_model_relations (sin caché).
 
-        with self.driver.session() as session:
-            result = session.run(query, model_name=model_name)
-            return [dict(record) for record in result]
+        Args:
+            model_name: Nombre del modelo
+
+        Yields:
+            Modelos relacionados, uno a uno
+        """
+        return self._iter_records(_Q_MODEL_RELATIONS, model_name=model_name)
 
     def get_module_dependencies(self, module_name: str) -> List[Dict]:
         """
@@ -202,15 +542,22 @@ class QueryEngine:
         Returns:
             Lista de módulos de los que depende
         """
-        query = f"""
-        MATCH (m:{self.schema.NODE_MODULE} {{name: $module_name}})-[:{self.schema.REL_MODULE_DEPENDS}]->(dep:{self.schema.NODE_MODULE})
-        RETURN dep.name as name, dep.version as version
-        ORDER BY dep.name
+        return self._cached(
+            ("dependencies", module_name),
+            lambda: list(self.iter_module_dependencies(module_name)),
+        )
+
+    def iter_module_dependencies(self, module_name: str) -> Iterator[Dict]:
         """
+        Versión en streaming de get_module_dependencies (sin caché).
 
-        with self.driver.session() as session:
-            result = session.run(query, module_name=module_name)
-            return [dict(record) for record in result]
+        Args:
+            module_name: Nombre del módulo
+
+        Yields:
+            Módulos de los que depende, uno a uno
+        """
+        return self._iter_records(_Q_MODULE_DEPENDENCIES, module_name=module_name)
 
     def get_module_dependents(self, module_name: str) -> List[Dict]:
         """
@@ -222,15 +569,22 @@ class QueryEngine:
         Returns:
             Lista de módulos dependientes
         """
-        query = f"""
-        MATCH (dependent:{self.schema.NODE_MODULE})-[:{self.schema.REL_MODULE_DEPENDS}]->(m:{self.schema.NODE_MODULE} {{name: $module_name}})
-        RETURN dependent.name as name, dependent.version as version
-        ORDER BY dependent.name
+        return self._cached(
+            ("dependents", module_name),
+            lambda: list(self.iter_module_dependents(module_name)),
+        )
+
+    def iter_module_dependents(self, module_name: str) -> Iterator[Dict]:
         """
+        Versión en streaming de get_module_dependents (sin caché).
 
-        with self.driver.session() as session:
-            result = session.run(query, module_name=module_name)
-            return [dict(record) for record in result]
+        Args:
+            module_name: Nombre del módulo
+
+        Yields:
+            Módulos dependientes, uno a uno
+        """
+        return self._iter_records(_Q_MODULE_DEPENDENTS, module_name=module_name)
 
     def search_models(self, search_term: str) -> List[Dict]:
         """
@@ -242,17 +596,22 @@ class QueryEngine:
         Returns:
             Lista de modelos que coinciden
         """
-        query = f"""
-        MATCH (m:{self.schema.NODE_MODEL})
-        WHERE m.name CONTAINS $search_term
-        RETURN m.name as name, m.module as module, m.description as description
-        ORDER BY m.name
-        LIMIT 50
+        return self._cached(
+            ("search", search_term),
+            lambda: list(self.iter_search_models(search_term)),
+        )
+
+    def iter_search_models(self, search_term: str) -> Iterator[Dict]:
         """
+        Versión en streaming de search_models (sin caché).
 
-        with self.driver.session() as session:
-            result = session.run(query, search_term=search_term)
-            return [dict(record) for record in result]
+        Args:
+            search_term: Término de búsqueda
+
+        Yields:
+            Modelos que coinciden, uno a uno
+        """
+        return self._iter_records(_Q_SEARCH_MODELS, search_term=search_term)
 
     def get_model_impact(self, model_name: str) -> Dict:
         """
@@ -264,30 +623,23 @@ class QueryEngine:
         Returns:
             Diccionario con análisis de impacto
         """
-        query = f"""
-        MATCH (m:{self.schema.NODE_MODEL} {{name: $model_name}})
-        OPTIONAL MATCH (child:{self.schema.NODE_MODEL})-[:{self.schema.REL_MODEL_INHERITS}]->(m)
-        OPTIONAL MATCH (v:{self.schema.NODE_VIEW})-[:{self.schema.REL_VIEW_FOR_MODEL}]->(m)
-        OPTIONAL MATCH (m)-[:{self.schema.REL_MODEL_HAS_FIELD}]->(f:{self.schema.NODE_FIELD})-[:{self.schema.REL_FIELD_RELATES_TO}]->(related:{self.schema.NODE_MODEL})
-        WITH m,
-             count(DISTINCT child) as children_count,
-             count(DISTINCT v) as views_count,
-             count(DISTINCT related) as related_models_count
-        RETURN m.name as model,
-               children_count,
-               views_count,
-               related_models_count
-        """
-
-        with self.driver.session() as session:
+        query = _Q_MODEL_IMPACT
+
+        def fetch():
+            session = self._get_session()
             result = session.run(query, model_name=model_name)
             record = result.single()
-            return dict(record) if record else {}
+            return record.data() if record else {}
+
+        return self._cached(("impact", model_name), fetch)
 
     def execute_custom_query(self, cypher_query: str, params: Dict = None) -> List[Dict]:
         """
         Ejecuta una consulta Cypher personalizada.
 
+        Los nodos y relaciones devueltos se convierten a diccionarios con
+        sus propiedades.
+
         Args:
             cypher_query: Query Cypher
             params: Parámetros de la query
@@ -295,6 +647,36 @@ class QueryEngine:
         Returns:
             Lista de resultados
         """
-        with self.driver.session() as session:
-            result = session.run(cypher_query, **(params or {}))
-            return [dict(record) for record in result]
+        return list(self.iter_custom_query(cypher_query, params))
+
+    def iter_custom_query(self, cypher_query: str, params: Dict = None) -> Iterator[Dict]:
+        """
+        Versión en streaming de execute_custom_query.
+
+        Args:
+            cypher_query: Query Cypher
+            params: Parámetros de la query
+
+        Yields:
+            Resultados, uno a uno
+        """
+        return self._iter_records(cypher_query, **(params or {}))
+
+    def execute_custom_query_df(self, cypher_query: str, params: Dict = None) -> "pandas.DataFrame":
+        """
+        Ejecuta una consulta Cypher personalizada y devuelve un DataFrame
+        (requiere pandas).
+
+        Args:
+            cypher_query: Query Cypher
+            params: Parámetros de la query
+
+        Returns:
+            DataFrame con una columna por clave del RETURN
+
+        Raises:
+            ImportError: Si pandas no está instalado
+        """
+        _require_pandas()
+        session = self._get_session()
+        return session.run(cypher_query, **(params or {})).to_df()
@@ -0,0 +1,59 @@
+"""
+Utilidades para recorrer el árbol de archivos de los módulos.
+"""
+import os
+from typing import Iterator, Optional, Set, Tuple, Union
+
+# Directorios que nunca contienen código fuente relevante
+SKIP_DIRS = frozenset({"__pycache__", ".git", "node_modules"})
+
+
+def iter_source_files(
+    root: Union[str, os.PathLike],
+    suffixes: Union[str, Tuple[str, ...]],
+    top_dirs: Optional[Set[str]] = None,
+    skip_dirs: Set[str] = SKIP_DIRS,
+) -> Iterator[str]:
+    """
+    Recorre un directorio con os.scandir devolviendo archivos fuente.
+
+    Los directorios excluidos se descartan antes de entrar en ellos, así
+    que nunca se listan. Los archivos .py de test (con "test_" en el
+    nombre) se omiten. Los enlaces simbólicos a directorios se siguen,
+    recordando (st_dev, st_ino) de cada directorio para no entrar en ciclos.
+
+    Args:
+        root: Directorio raíz
+        suffixes: Extensión o tupla de extensiones (p. ej. ".py")
+        top_dirs: Si se indica, solo se desciende en estos subdirectorios
+            de la raíz (los archivos de la raíz se incluyen siempre)
+        skip_dirs: Nombres de directorio a no recorrer
+
+    Yields:
+        Rutas de archivo como string
+    """
+    stack = [(os.fspath(root), True)]
+    visited = set()
+    while stack:
+        path, is_root = stack.pop()
+        try:
+            stat = os.stat(path)
+            if (stat.st_dev, stat.st_ino) in visited:
+                continue
+            visited.add((stat.st_dev, stat.st_ino))
+
+            with os.scandir(path) as it:
+                for entry in it:
+                    name = entry.name
+                    if entry.is_dir():
+                        if name in skip_dirs:
+                            continue
+                        if is_root and top_dirs is not None and name not in top_dirs:
+                            continue
+                        stack.append((entry.path, False))
+                    elif name.endswith(suffixes):
+                        if name.endswith(".py") and "test_" in name:
+                            continue
+                        yield entry.path
+        except OSError as e:
+            print(f"Error leyendo directorio {path}: {e}")
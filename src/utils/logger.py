@@ -1,9 +1,22 @@
 """
 Sistema de logging estructurado.
 """
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
+import threading
 from pathlib import Path
+from typing import Dict
+
+# Loggers ya configurados por nombre: las llamadas repetidas devuelven el
+# mismo logger sin volver a crear formatter ni handlers
+_LOGGERS: Dict[str, logging.Logger] = {}
+_LOG_LOCK = threading.Lock()
+
+# Listeners que escriben los archivos de log en segundo plano, por logger
+_LISTENERS: Dict[str, logging.handlers.QueueListener] = {}
 
 
 def setup_logger(
@@ -19,6 +32,29 @@ def setup_logger(
         level: Nivel de logging (DEBUG, INFO, WARNING, ERROR)
         log_file: Ruta opcional al archivo de log
 
+    Returns:
+        Logger configurado
+    """
+    with _LOG_LOCK:
+        logger = _LOGGERS.get(name)
+        if logger is not None:
+            logger.setLevel(level)
+            return logger
+
+        logger = _configure_logger(name, level, log_file)
+        _LOGGERS[name] = logger
+        return logger
+
+
+def _configure_logger(name: str, level: int, log_file: Path = None) -> logging.Logger:
+    """
+    Crea los handlers de un logger (solo la primera vez por nombre).
+
+    Args:
+        name: Nombre del logger
+        level: Nivel de logging
+        log_file: Ruta opcional al archivo de log
+
     Returns:
         Logger configurado
     """
@@ -41,12 +77,22 @@ def setup_logger(
     console_handler.setFormatter(formatter)
     logger.addHandler(console_handler)
 
-    # Handler opcional para archivo
+    # Handler opcional para archivo: el logger solo encola el registro y un
+    # QueueListener lo escribe en disco desde su propio hilo
     if log_file:
-        file_handler = logging.FileHandler(log_file)
+        file_handler = logging.FileHandler(log_file, delay=True)
         file_handler.setLevel(level)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+
+        log_queue = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(
+            log_queue, file_handler, respect_handler_level=True
+        )
+        listener.start()
+        atexit.register(listener.stop)
+        _LISTENERS[name] = listener
+
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
 
     return logger
 
@@ -1,8 +1,39 @@
 """
 Utilidades para serialización de datos a formatos compatibles con Neo4j.
 """
-import json
-from typing import Any, Dict, List
+import orjson
+from typing import Any, Callable, Dict, List
+
+
+def _dumps(value: Any) -> str:
+    """
+    Serializa una colección a string JSON con orjson.
+
+    Args:
+        value: Lista o diccionario
+
+    Returns:
+        String JSON
+    """
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+def _identity(value: Any) -> Any:
+    """Devuelve el valor sin cambios (tipos que Neo4j almacena tal cual)."""
+    return value
+
+
+# Despacho por tipo exacto: un lookup en dict en lugar de una cadena de
+# isinstance. bool va en su propia entrada (type(True) is bool)
+_DISPATCH: Dict[type, Callable[[Any], Any]] = {
+    str: _identity,
+    int: _identity,
+    float: _identity,
+    bool: _identity,
+    type(None): _identity,
+    list: _dumps,
+    dict: _dumps,
+}
 
 
 def serialize_for_neo4j(value: Any) -> Any:
@@ -18,11 +49,16 @@ def serialize_for_neo4j(value: Any) -> Any:
     Returns:
         Valor compatible con Neo4j
     """
+    handler = _DISPATCH.get(type(value))
+    if handler is not None:
+        return handler(value)
+
+    # Subclases (p. ej. enums de str) y tipos no contemplados
     if value is None:
         return None
     elif isinstance(value, (list, dict)):
         # Convertir colecciones anidadas a JSON string
-        return json.dumps(value)
+        return _dumps(value)
     elif isinstance(value, bool):
         return value
     elif isinstance(value, (int, float, str)):
@@ -44,10 +80,8 @@ def prepare_batch_for_neo4j(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]
     Returns:
         Lista de diccionarios con valores serializados
     """
-    prepared = []
-    for item in items:
-        prepared_item = {}
-        for key, value in item.items():
-            prepared_item[key] = serialize_for_neo4j(value)
-        prepared.append(prepared_item)
-    return prepared
+    # Referencia local: evita la búsqueda global por cada valor
+    serialize = serialize_for_neo4j
+    return [
+        {key: serialize(value) for key, value in item.items()} for item in items
+    ]
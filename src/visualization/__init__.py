@@ -2,5 +2,6 @@
 Visualización del grafo de dependencias.
 """
 from .graph_visualizer import GraphVisualizer
+from .async_graph_visualizer import AsyncGraphVisualizer
 
-__all__ = ["GraphVisualizer"]
+__all__ = ["GraphVisualizer", "AsyncGraphVisualizer"]
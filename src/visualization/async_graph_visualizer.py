@@ -0,0 +1,180 @@
+"""
+Visualizador de grafos con el driver asíncrono de Neo4j.
+"""
+import asyncio
+from pathlib import Path
+from typing import List, Dict, Optional
+from neo4j import AsyncGraphDatabase
+from config import Config
+from src.graph.schema import GraphSchema
+from .graph_visualizer import (
+    _Q_MODEL_RELATIONS,
+    _model_hierarchy_query,
+    _render_hierarchy,
+    _render_relations,
+)
+
+
+class AsyncGraphVisualizer:
+    """
+    Visualizador que lanza las queries de varias visualizaciones en paralelo.
+
+    Cada visualización usa su propia sesión sobre un único driver asíncrono,
+    así que las queries independientes no esperan unas a otras. La
+    concurrencia se limita al tamaño del pool de conexiones.
+    """
+
+    def __init__(
+        self,
+        uri: str = None,
+        user: str = None,
+        password: str = None,
+        max_depth: int = 6,
+        max_rows: int = 10_000,
+    ):
+        """
+        Inicializa el visualizador.
+
+        Args:
+            uri: URI de Neo4j
+            user: Usuario
+            password: Contraseña
+            max_depth: Profundidad máxima permitida en la jerarquía (las
+                profundidades mayores se recortan y las menores que 1 se
+                llevan a 1)
+            max_rows: Máximo de caminos por modelo visualizado
+        """
+        self.uri = uri or Config.NEO4J_URI
+        self.user = user or Config.NEO4J_USER
+        self.password = password or Config.NEO4J_PASSWORD
+        self.max_depth = max_depth
+        self.max_rows = max_rows
+
+        self.driver = AsyncGraphDatabase.driver(
+            self.uri,
+            auth=(self.user, self.password),
+            max_connection_pool_size=Config.NEO4J_MAX_POOL_SIZE,
+        )
+        self.schema = GraphSchema()
+        # Limita las queries en vuelo para no esperar conexiones del pool
+        self._semaphore = asyncio.Semaphore(Config.NEO4J_MAX_POOL_SIZE)
+
+    async def close(self):
+        """Cierra la conexión."""
+        if self.driver:
+            await self.driver.close()
+
+    async def __aenter__(self):
+        """Async context manager enter."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.close()
+
+    async def _fetch_graph(self, query: str, model_name: str, **params) -> Optional[Dict]:
+        """
+        Ejecuta una query de visualización para un modelo.
+
+        Args:
+            query: Query Cypher (recibe $names)
+            model_name: Nombre del modelo
+            **params: Parámetros adicionales de la query
+
+        Returns:
+            Diccionario con nodes y edges, o None si no hay datos
+        """
+        async with self._semaphore:
+            async with self.driver.session() as session:
+                result = await session.run(query, names=[model_name], **params)
+                records = await result.data()
+
+        if not records:
+            return None
+        return {"nodes": records[0]["nodes"], "edges": records[0]["edges"]}
+
+    async def visualize_model_hierarchy(
+        self, model_name: str, output_file: Path, depth: int = 3
+    ) -> Optional[Path]:
+        """
+        Visualiza la jerarquía de herencia de un modelo.
+
+        Args:
+            model_name: Nombre del modelo
+            output_file: Ruta del archivo HTML de salida
+            depth: Profundidad de la jerarquía
+
+        Returns:
+            Archivo generado, o None si no se encontró el modelo
+        """
+        query = _model_hierarchy_query(max(1, min(depth, self.max_depth)))
+        graph = await self._fetch_graph(query, model_name, max_rows=self.max_rows)
+
+        if not graph:
+            print(f"No se encontró el modelo {model_name}")
+            return None
+
+        _render_hierarchy(graph, output_file)
+        return output_file
+
+    async def visualize_model_relations(
+        self, model_name: str, output_file: Path
+    ) -> Optional[Path]:
+        """
+        Visualiza las relaciones de campos de un modelo.
+
+        Args:
+            model_name: Nombre del modelo
+            output_file: Ruta del archivo HTML de salida
+
+        Returns:
+            Archivo generado, o None si no hay relaciones
+        """
+        graph = await self._fetch_graph(_Q_MODEL_RELATIONS, model_name)
+
+        if not graph:
+            print(f"No se encontraron relaciones para {model_name}")
+            return None
+
+        _render_relations(graph, output_file)
+        return output_file
+
+    async def visualize_all(
+        self,
+        model_names: List[str],
+        output_dir: Path,
+        depth: int = 3,
+        kind: str = "hierarchy",
+    ) -> Dict[str, Path]:
+        """
+        Visualiza varios modelos con sus queries en paralelo.
+
+        Genera un HTML por modelo en output_dir ({modelo}_{kind}.html).
+
+        Args:
+            model_names: Nombres de los modelos
+            output_dir: Directorio de salida
+            depth: Profundidad de la jerarquía (solo kind="hierarchy")
+            kind: "hierarchy" (herencia) o "relations" (campos relacionales)
+
+        Returns:
+            Diccionario modelo -> archivo generado
+        """
+        if kind not in ("hierarchy", "relations"):
+            raise ValueError(f"Tipo de visualización desconocido: {kind}")
+
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        def visualize(model_name):
+            output_file = output_dir / f"{model_name}_{kind}.html"
+            if kind == "hierarchy":
+                return self.visualize_model_hierarchy(model_name, output_file, depth)
+            return self.visualize_model_relations(model_name, output_file)
+
+        results = await asyncio.gather(*(visualize(name) for name in model_names))
+        return {
+            name: output_file
+            for name, output_file in zip(model_names, results)
+            if output_file is not None
+        }
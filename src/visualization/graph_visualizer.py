@@ -1,19 +1,302 @@
 """
 Visualizador de grafos usando pyvis y networkx.
 """
+import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Iterable, List, Dict, Optional, Tuple
 import networkx as nx
 from pyvis.network import Network
 from neo4j import GraphDatabase
+from neo4j.exceptions import ClientError
 from config import Config
 from src.graph.schema import GraphSchema
 
+# Queries construidas una sola vez al importar: el texto idéntico entre
+# llamadas permite a Neo4j reutilizar el plan cacheado
+_S = GraphSchema
+
+# Color de nodo según sea el nodo raíz (rojo) o no (azul)
+_NODE_COLORS = {True: "#ff6b6b", False: "#4dabf7"}
+
+_Q_MODEL_RELATIONS = f"""
+    UNWIND $names AS model_name
+    MATCH (m:{_S.NODE_MODEL} {{name: model_name}})-[:{_S.REL_MODEL_HAS_FIELD}]->(f:{_S.NODE_FIELD})
+    MATCH (f)-[:{_S.REL_FIELD_RELATES_TO}]->(target:{_S.NODE_MODEL})
+    WITH
+        m,
+        collect({{
+            source: m.name,
+            field_name: f.name,
+            field_type: f.field_type,
+            target: target.name
+        }}) as edges,
+        collect(DISTINCT target) as targets
+    UNWIND [m] + targets as n
+    RETURN
+        m.name as model_name,
+        collect(DISTINCT {{name: n.name, is_root: n = m}}) as nodes,
+        edges
+"""
+
+_Q_MODULE_DEPENDENCY_PATHS = f"""
+    UNWIND $names AS module_name
+    MATCH (m:{_S.NODE_MODULE} {{name: module_name}})
+    OPTIONAL MATCH (m)((:{_S.NODE_MODULE})-[r:{_S.REL_MODULE_DEPENDS}]->(:{_S.NODE_MODULE})){{1,2}}
+    WITH m, collect(r)[..$max_rows] as paths
+    UNWIND paths as rels
+    UNWIND rels as rel
+    WITH m, startNode(rel) as source, endNode(rel) as target
+    WITH
+        m,
+        collect(DISTINCT {{source: source.name, target: target.name}}) as edges,
+        collect(DISTINCT source) + collect(DISTINCT target) as members
+    UNWIND members as n
+    RETURN collect(DISTINCT {{name: n.name, is_root: n = m}}) as nodes, edges
+"""
+
+_Q_ALL_MODULE_DEPENDENCIES = f"""
+    MATCH (m:{_S.NODE_MODULE})-[:{_S.REL_MODULE_DEPENDS}]->(dep:{_S.NODE_MODULE})
+    WITH m, dep
+    LIMIT 200
+    WITH
+        collect({{source: m.name, target: dep.name}}) as edges,
+        collect(DISTINCT m) + collect(DISTINCT dep) as members
+    UNWIND members as n
+    RETURN collect(DISTINCT {{name: n.name, is_root: false}}) as nodes, edges
+"""
+
+_Q_EXPORT_GRAPHML_APOC = """
+    CALL apoc.export.graphml.all($file, {useTypes: true, storeNodeIds: true})
+    YIELD nodes, relationships
+    RETURN nodes, relationships
+"""
+
+_Q_EXPORT_EDGES = """
+    MATCH (n)-[r]->(m)
+    RETURN
+        id(n) as source_id,
+        labels(n)[0] as source_type,
+        n.name as source_name,
+        type(r) as rel_type,
+        id(m) as target_id,
+        labels(m)[0] as target_type,
+        m.name as target_name
+"""
+
+
+@lru_cache(maxsize=None)
+def _model_hierarchy_query(depth: int) -> str:
+    """
+    Construye (una vez por profundidad) la query de jerarquía de herencia.
+
+    Usa quantified path patterns (Neo4j 5.9+): la restricción de etiqueta se
+    aplica en cada salto, así que Neo4j poda durante la expansión en lugar
+    de filtrar caminos completos. Hijos y padres se recorren en un
+    subquery con UNION, sin el producto cartesiano de dos OPTIONAL MATCH.
+
+    Args:
+        depth: Profundidad de la jerarquía
+
+    Returns:
+        Query Cypher
+    """
+    return f"""
+    UNWIND $names AS model_name
+    MATCH (root:{_S.NODE_MODEL} {{name: model_name}})
+    CALL {{
+        WITH root
+        MATCH ((:{_S.NODE_MODEL})-[r:{_S.REL_MODEL_INHERITS}]->(:{_S.NODE_MODEL})){{1,{depth}}}(root)
+        RETURN r as rels
+        UNION
+        WITH root
+        MATCH (root)((:{_S.NODE_MODEL})-[r:{_S.REL_MODEL_INHERITS}]->(:{_S.NODE_MODEL})){{1,{depth}}}
+        RETURN r as rels
+    }}
+    WITH root, collect(rels)[..$max_rows] as paths
+    UNWIND paths as rels
+    UNWIND rels as rel
+    WITH root, startNode(rel) as source, endNode(rel) as target
+    WITH
+        root,
+        collect(DISTINCT {{source: source.name, target: target.name}}) as edges,
+        collect(DISTINCT source) + collect(DISTINCT target) as members
+    UNWIND members as n
+    RETURN
+        root.name as root_name,
+        collect(DISTINCT {{
+            name: n.name,
+            module: n.module,
+            is_root: n = root
+        }}) as nodes,
+        edges
+    """
+
+
+class _NodeIdList(list):
+    """
+    Lista de ids de nodo con pertenencia en O(1).
+
+    Network.add_node y add_edge comprueban si un id existe con `in` sobre
+    node_ids; con una lista eso es lineal y una visualización grande se
+    vuelve cuadrática. El índice se mantiene en append, la única operación
+    con la que pyvis modifica la lista.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._index = set()
+
+    def append(self, n_id):
+        super().append(n_id)
+        self._index.add(n_id)
+
+    def __contains__(self, n_id):
+        return n_id in self._index
+
+
+class _IndexedNetwork(Network):
+    """Network de pyvis cuyos ids de nodo se buscan en un set."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.node_ids = _NodeIdList()
+
+
+def _add_graph(
+    net: Network,
+    nodes: Iterable[Tuple[str, Dict]],
+    edges: Iterable[Tuple[str, str, Dict]],
+):
+    """
+    Agrega a una red de pyvis los nodos y aristas de una visualización.
+
+    Los nodos y aristas ya llegan deduplicados desde Neo4j; se agregan con
+    la API pública de pyvis, que además verifica que los extremos de cada
+    arista existan (en O(1) si net es un _IndexedNetwork).
+
+    Args:
+        net: Red de pyvis
+        nodes: Pares (id, opciones del nodo: label, color, title...)
+        edges: Tuplas (origen, destino, opciones de la arista)
+    """
+    for n_id, options in nodes:
+        net.add_node(n_id, **options)
+
+    for source, target, options in edges:
+        net.add_edge(source, target, **options)
+
+
+def _render_hierarchy(graph: Dict, output_file: Path):
+    """
+    Genera el HTML de la jerarquía de herencia de un modelo.
+
+    Args:
+        graph: Nodos (name, module, is_root) y aristas (source, target)
+        output_file: Ruta del archivo HTML de salida
+    """
+    # Crear grafo
+    net = _IndexedNetwork(height="800px", width="100%", directed=True, notebook=False)
+    net.toggle_physics(True)
+
+    # Configurar opciones visuales
+    net.set_options(
+        """
+    {
+        "nodes": {
+            "font": {"size": 16}
+        },
+        "edges": {
+            "arrows": {"to": {"enabled": true}},
+            "smooth": {"type": "continuous"}
+        },
+        "physics": {
+            "enabled": true,
+            "stabilization": {"iterations": 100}
+        }
+    }
+    """
+    )
+
+    # Agregar nodos y relaciones
+    _add_graph(
+        net,
+        (
+            (
+                node["name"],
+                {
+                    "label": f"{node['name']}\n({node['module']})",
+                    "color": _NODE_COLORS[node["is_root"]],
+                    "title": f"Modelo: {node['name']}\nMódulo: {node['module']}",
+                },
+            )
+            for node in graph["nodes"]
+        ),
+        (
+            (edge["source"], edge["target"], {"title": "inherits"})
+            for edge in graph["edges"]
+        ),
+    )
+
+    # Guardar
+    net.save_graph(str(output_file))
+    print(f"Visualización guardada en: {output_file}")
+
+
+def _render_relations(graph: Dict, output_file: Path):
+    """
+    Genera el HTML de las relaciones de campos de un modelo.
+
+    Args:
+        graph: Nodos (name, is_root) y aristas
+            (source, field_name, field_type, target)
+        output_file: Ruta del archivo HTML de salida
+    """
+    # Crear grafo
+    net = _IndexedNetwork(height="800px", width="100%", directed=True)
+    net.toggle_physics(True)
+
+    # Agregar nodos y relaciones con etiqueta del campo
+    _add_graph(
+        net,
+        (
+            (
+                node["name"],
+                {
+                    "label": node["name"],
+                    "color": _NODE_COLORS[node["is_root"]],
+                },
+            )
+            for node in graph["nodes"]
+        ),
+        (
+            (
+                edge["source"],
+                edge["target"],
+                {
+                    "label": f"{edge['field_name']}\n({edge['field_type']})",
+                    "title": f"Campo: {edge['field_name']}\nTipo: {edge['field_type']}",
+                },
+            )
+            for edge in graph["edges"]
+        ),
+    )
+
+    net.save_graph(str(output_file))
+    print(f"Visualización guardada en: {output_file}")
+
 
 class GraphVisualizer:
     """Visualizador de grafos de dependencias Odoo."""
 
-    def __init__(self, uri: str = None, user: str = None, password: str = None):
+    def __init__(
+        self,
+        uri: str = None,
+        user: str = None,
+        password: str = None,
+        max_depth: int = 6,
+        max_rows: int = 10_000,
+    ):
         """
         Inicializa el visualizador.
 
@@ -21,12 +304,22 @@ class GraphVisualizer:
             uri: URI de Neo4j
             user: Usuario
             password: Contraseña
+            max_depth: Profundidad máxima permitida en la jerarquía (las
+                profundidades mayores se recortan y las menores que 1 se
+                llevan a 1)
+            max_rows: Máximo de caminos por modelo o módulo visualizado
         """
         self.uri = uri or Config.NEO4J_URI
         self.user = user or Config.NEO4J_USER
         self.password = password or Config.NEO4J_PASSWORD
+        self.max_depth = max_depth
+        self.max_rows = max_rows
 
-        self.driver = GraphDatabase.driver(self.uri, auth=(self.user, self.password))
+        self.driver = GraphDatabase.driver(
+            self.uri,
+            auth=(self.user, self.password),
+            max_connection_pool_size=Config.NEO4J_MAX_POOL_SIZE,
+        )
         self.schema = GraphSchema()
 
     def close(self):
@@ -42,104 +335,73 @@ class GraphVisualizer:
         """Context manager exit."""
         self.close()
 
-    def visualize_model_hierarchy(
-        self, model_name: str, output_file: Path, depth: int = 3
-    ):
+    def _fetch_hierarchy_edges(
+        self, model_names: List[str], depth: int = 3
+    ) -> Dict[str, Dict]:
         """
-        Visualiza la jerarquía de herencia de un modelo.
+        Obtiene la jerarquía de herencia de varios modelos en una sola query.
+
+        La profundidad se recorta a max_depth y los caminos por modelo a
+        max_rows, porque el coste de los patrones de longitud variable crece
+        de forma explosiva con la profundidad.
 
         Args:
-            model_name: Nombre del modelo
-            output_file: Ruta del archivo HTML de salida
+            model_names: Nombres de los modelos raíz
             depth: Profundidad de la jerarquía
+
+        Returns:
+            Diccionario modelo raíz -> {"nodes": [...], "edges": [...]},
+            con nodos y aristas ya deduplicados por Neo4j
         """
-        # Obtener datos del grafo
-        query = f"""
-        MATCH (root:{self.schema.NODE_MODEL} {{name: $model_name}})
-        OPTIONAL MATCH path1 = (child:{self.schema.NODE_MODEL})-[:{self.schema.REL_MODEL_INHERITS}*..{depth}]->(root)
-        OPTIONAL MATCH path2 = (root)-[:{self.schema.REL_MODEL_INHERITS}*..{depth}]->(parent:{self.schema.NODE_MODEL})
-        WITH root, collect(path1) + collect(path2) as paths
-        UNWIND paths as path
-        UNWIND relationships(path) as rel
-        WITH root, startNode(rel) as source, endNode(rel) as target
-        RETURN DISTINCT
-            root.name as root_name,
-            source.name as source,
-            target.name as target,
-            source.module as source_module,
-            target.module as target_module
-        """
+        query = _model_hierarchy_query(max(1, min(depth, self.max_depth)))
 
         with self.driver.session() as session:
-            result = session.run(query, model_name=model_name)
-            records = [dict(record) for record in result]
+            result = session.run(
+                query, names=list(model_names), max_rows=self.max_rows
+            )
+            return {
+                record["root_name"]: {"nodes": record["nodes"], "edges": record["edges"]}
+                for record in result
+            }
 
-        if not records:
-            print(f"No se encontró el modelo {model_name}")
-            return
+    def _fetch_relation_edges(self, model_names: List[str]) -> Dict[str, Dict]:
+        """
+        Obtiene las relaciones de campos de varios modelos en una sola query.
 
-        # Crear grafo
-        net = Network(height="800px", width="100%", directed=True, notebook=False)
-        net.toggle_physics(True)
+        Args:
+            model_names: Nombres de los modelos
+
+        Returns:
+            Diccionario modelo -> {"nodes": [...], "edges": [...]}, con
+            aristas (source, field_name, field_type, target)
+        """
+        query = _Q_MODEL_RELATIONS
 
-        # Configurar opciones visuales
-        net.set_options(
-            """
-        {
-            "nodes": {
-                "font": {"size": 16}
-            },
-            "edges": {
-                "arrows": {"to": {"enabled": true}},
-                "smooth": {"type": "continuous"}
-            },
-            "physics": {
-                "enabled": true,
-                "stabilization": {"iterations": 100}
+        with self.driver.session() as session:
+            result = session.run(query, names=list(model_names))
+            return {
+                record["model_name"]: {"nodes": record["nodes"], "edges": record["edges"]}
+                for record in result
             }
-        }
+
+    def visualize_model_hierarchy(
+        self, model_name: str, output_file: Path, depth: int = 3
+    ):
         """
-        )
+        Visualiza la jerarquía de herencia de un modelo.
 
-        # Agregar nodos y relaciones
-        added_nodes = set()
-
-        for record in records:
-            source = record["source"]
-            target = record["target"]
-            root_name = record["root_name"]
-
-            # Determinar colores
-            def get_color(node_name):
-                if node_name == root_name:
-                    return "#ff6b6b"  # Rojo para nodo raíz
-                return "#4dabf7"  # Azul para otros
-
-            # Agregar nodos
-            if source not in added_nodes:
-                net.add_node(
-                    source,
-                    label=f"{source}\n({record['source_module']})",
-                    color=get_color(source),
-                    title=f"Modelo: {source}\nMódulo: {record['source_module']}",
-                )
-                added_nodes.add(source)
-
-            if target not in added_nodes:
-                net.add_node(
-                    target,
-                    label=f"{target}\n({record['target_module']})",
-                    color=get_color(target),
-                    title=f"Modelo: {target}\nMódulo: {record['target_module']}",
-                )
-                added_nodes.add(target)
+        Args:
+            model_name: Nombre del modelo
+            output_file: Ruta del archivo HTML de salida
+            depth: Profundidad de la jerarquía
+        """
+        graph = self._fetch_hierarchy_edges([model_name], depth).get(model_name)
 
-            # Agregar relación
-            net.add_edge(source, target, title="inherits")
+        if not graph:
+            print(f"No se encontró el modelo {model_name}")
+            return
 
-        # Guardar
-        net.save_graph(str(output_file))
-        print(f"Visualización guardada en: {output_file}")
+        _render_hierarchy(graph, output_file)
 
     def visualize_model_relations(
         self, model_name: str, output_file: Path, depth: int = 2
@@ -152,51 +414,60 @@ class GraphVisualizer:
             output_file: Ruta del archivo HTML de salida
             depth: Profundidad de relaciones
         """
-        query = f"""
-        MATCH (m:{self.schema.NODE_MODEL} {{name: $model_name}})-[:{self.schema.REL_MODEL_HAS_FIELD}]->(f:{self.schema.NODE_FIELD})
-        MATCH (f)-[:{self.schema.REL_FIELD_RELATES_TO}]->(target:{self.schema.NODE_MODEL})
-        RETURN m.name as source, f.name as field_name, f.field_type as field_type, target.name as target
-        """
+        graph = self._fetch_relation_edges([model_name]).get(model_name)
 
-        with self.driver.session() as session:
-            result = session.run(query, model_name=model_name)
-            records = [dict(record) for record in result]
-
-        if not records:
+        if not graph:
             print(f"No se encontraron relaciones para {model_name}")
             return
 
-        # Crear grafo
-        net = Network(height="800px", width="100%", directed=True)
-        net.toggle_physics(True)
+        _render_relations(graph, output_file)
 
-        added_nodes = set()
-
-        for record in records:
-            source = record["source"]
-            target = record["target"]
-            field_name = record["field_name"]
-            field_type = record["field_type"]
-
-            # Agregar nodos
-            if source not in added_nodes:
-                net.add_node(source, label=source, color="#ff6b6b")
-                added_nodes.add(source)
-
-            if target not in added_nodes:
-                net.add_node(target, label=target, color="#4dabf7")
-                added_nodes.add(target)
-
-            # Agregar relación con etiqueta del campo
-            net.add_edge(
-                source,
-                target,
-                label=f"{field_name}\n({field_type})",
-                title=f"Campo: {field_name}\nTipo: {field_type}",
-            )
+    def visualize_many(
+        self,
+        model_names: List[str],
+        output_dir: Path,
+        depth: int = 3,
+        kind: str = "hierarchy",
+    ) -> Dict[str, Path]:
+        """
+        Visualiza varios modelos con una sola query a Neo4j.
+
+        Genera un HTML por modelo en output_dir ({modelo}_{kind}.html).
+
+        Args:
+            model_names: Nombres de los modelos
+            output_dir: Directorio de salida
+            depth: Profundidad de la jerarquía (solo kind="hierarchy")
+            kind: "hierarchy" (herencia) o "relations" (campos relacionales)
+
+        Returns:
+            Diccionario modelo -> archivo generado
+        """
+        if kind == "hierarchy":
+            graph_by_model = self._fetch_hierarchy_edges(model_names, depth)
+        elif kind == "relations":
+            graph_by_model = self._fetch_relation_edges(model_names)
+        else:
+            raise ValueError(f"Tipo de visualización desconocido: {kind}")
+
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        generated = {}
+        for model_name in model_names:
+            graph = graph_by_model.get(model_name)
+            if not graph:
+                print(f"Sin datos de {kind} para {model_name}")
+                continue
+
+            output_file = output_dir / f"{model_name}_{kind}.html"
+            if kind == "hierarchy":
+                _render_hierarchy(graph, output_file)
+            else:
+                _render_relations(graph, output_file)
+            generated[model_name] = output_file
 
-        net.save_graph(str(output_file))
-        print(f"Visualización guardada en: {output_file}")
+        return generated
 
     def visualize_module_dependencies(
         self, module_name: str = None, output_file: Path = None
@@ -209,94 +480,114 @@ class GraphVisualizer:
             output_file: Ruta del archivo HTML de salida
         """
         if module_name:
-            query = f"""
-            MATCH (m:{self.schema.NODE_MODULE} {{name: $module_name}})
-            OPTIONAL MATCH path = (m)-[:{self.schema.REL_MODULE_DEPENDS}*..2]->(dep:{self.schema.NODE_MODULE})
-            WITH m, collect(path) as paths
-            UNWIND paths as path
-            UNWIND relationships(path) as rel
-            WITH startNode(rel) as source, endNode(rel) as target
-            RETURN DISTINCT source.name as source, target.name as target
-            """
-            params = {"module_name": module_name}
+            query = _Q_MODULE_DEPENDENCY_PATHS
+            params = {"names": [module_name], "max_rows": self.max_rows}
         else:
-            query = f"""
-            MATCH (m:{self.schema.NODE_MODULE})-[:{self.schema.REL_MODULE_DEPENDS}]->(dep:{self.schema.NODE_MODULE})
-            RETURN m.name as source, dep.name as target
-            LIMIT 200
-            """
+            query = _Q_ALL_MODULE_DEPENDENCIES
             params = {}
 
         with self.driver.session() as session:
             result = session.run(query, **params)
-            records = [dict(record) for record in result]
+            graph = result.single()
 
-        if not records:
+        if not graph or not graph["edges"]:
             print("No se encontraron dependencias")
             return
 
         # Crear grafo
-        net = Network(height="800px", width="100%", directed=True)
+        net = _IndexedNetwork(height="800px", width="100%", directed=True)
         net.toggle_physics(True)
 
-        added_nodes = set()
-
-        for record in records:
-            source = record["source"]
-            target = record["target"]
-
-            # Determinar color
-            highlight_color = "#ff6b6b" if source == module_name else "#4dabf7"
-
-            if source not in added_nodes:
-                net.add_node(source, label=source, color=highlight_color)
-                added_nodes.add(source)
-
-            if target not in added_nodes:
-                net.add_node(target, label=target, color="#4dabf7")
-                added_nodes.add(target)
-
-            net.add_edge(source, target)
+        _add_graph(
+            net,
+            (
+                (
+                    node["name"],
+                    {
+                        "label": node["name"],
+                        "color": _NODE_COLORS[node["is_root"]],
+                    },
+                )
+                for node in graph["nodes"]
+            ),
+            ((edge["source"], edge["target"], {}) for edge in graph["edges"]),
+        )
 
         output = output_file or Path("module_dependencies.html")
         net.save_graph(str(output))
         print(f"Visualización guardada en: {output}")
 
-    def export_to_graphml(self, output_file: Path):
+    def export_to_graphml(self, output_file: Path, use_apoc: bool = None):
         """
         Exporta el grafo completo a formato GraphML.
 
+        Con APOC el archivo lo escribe el propio servidor, sin transferir el
+        grafo al cliente; la ruta es la del servidor y requiere
+        apoc.export.file.enabled=true. Si APOC no está disponible se usa la
+        exportación con NetworkX.
+
         Args:
             output_file: Ruta del archivo de salida
+            use_apoc: Exportar con apoc.export.graphml.all (default:
+                Config.USE_APOC)
         """
-        # Obtener todos los nodos y relaciones
-        query = """
-        MATCH (n)-[r]->(m)
-        RETURN
-            id(n) as source_id,
-            labels(n)[0] as source_type,
-            n.name as source_name,
-            type(r) as rel_type,
-            id(m) as target_id,
-            labels(m)[0] as target_type,
-            m.name as target_name
-        """
+        if use_apoc is None:
+            use_apoc = Config.USE_APOC
 
-        with self.driver.session() as session:
-            result = session.run(query)
-            records = [dict(record) for record in result]
+        if use_apoc and self._export_to_graphml_apoc(Path(output_file)):
+            return
 
-        # Crear grafo NetworkX
+        # Obtener todos los nodos y relaciones
+        query = _Q_EXPORT_EDGES
+
+        # Crear grafo NetworkX directamente desde el stream del driver, sin
+        # materializar antes la lista de registros
         G = nx.DiGraph()
 
-        for record in records:
-            source = f"{record['source_type']}:{record['source_name']}"
-            target = f"{record['target_type']}:{record['target_name']}"
+        # Id de nodo "tipo:nombre" construido e internado una sola vez por
+        # nodo; la primera vez se agrega el nodo con sus atributos
+        node_keys: Dict[Tuple[str, str], str] = {}
+
+        def node_key(node_type: str, name: str) -> str:
+            key = node_keys.get((node_type, name))
+            if key is None:
+                key = node_keys[(node_type, name)] = sys.intern(f"{node_type}:{name}")
+                G.add_node(key, type=node_type, name=name)
+            return key
 
-            G.add_node(source, type=record["source_type"], name=record["source_name"])
-            G.add_node(target, type=record["target_type"], name=record["target_name"])
-            G.add_edge(source, target, relationship=record["rel_type"])
+        with self.driver.session() as session:
+            for record in session.run(query):
+                G.add_edge(
+                    node_key(record["source_type"], record["source_name"]),
+                    node_key(record["target_type"], record["target_name"]),
+                    relationship=record["rel_type"],
+                )
 
-        # Exportar
-        nx.write_graphml(G, output_file)
+        # Exportar con el escritor basado en lxml
+        nx.write_graphml_lxml(G, output_file)
         print(f"Grafo exportado a GraphML: {output_file}")
+
+    def _export_to_graphml_apoc(self, output_file: Path) -> bool:
+        """
+        Exporta el grafo a GraphML en el servidor con APOC.
+
+        Args:
+            output_file: Ruta del archivo de salida (en el servidor)
+
+        Returns:
+            True si APOC exportó el grafo, False si no está disponible
+        """
+        try:
+            with self.driver.session() as session:
+                record = session.run(
+                    _Q_EXPORT_GRAPHML_APOC, file=str(output_file.resolve())
+                ).single()
+        except ClientError as e:
+            print(f"Warning: exportación con APOC no disponible ({e.code}), usando NetworkX")
+            return False
+
+        print(
+            f"Grafo exportado a GraphML con APOC: {output_file} "
+            f"({record['nodes']} nodos, {record['relationships']} relaciones)"
+        )
+        return True